@@ -0,0 +1,4 @@
+import time
+
+# Taken before any dependency is imported, startup timings are relative to it
+started_at = time.perf_counter()
@@ -1,6 +1,7 @@
+import argparse
 import asyncio
+import sys
 import tomllib
-import weakref
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager, suppress
 from pathlib import Path
@@ -12,10 +13,62 @@ import watchfiles
 from aiohttp import web
 from typenv import Env
 
-from livingdex import app_keys
+from livingdex import app_keys, dotnet, export, pages, sse, startup
 from livingdex.game_data import GameData
 from livingdex.input_screenshots import InputScreenshots
-from livingdex.routes import routes, send_sse_updates
+from livingdex.reload_scheduler import ReloadScheduler
+from livingdex.routes import routes
+
+
+async def load_game(
+    app: web.Application, game: GameData, semaphore: asyncio.Semaphore
+) -> bool:
+    async with semaphore:
+        try:
+            await game.load_data()
+        except Exception as e:
+            print(f"Unable to load {game.game_id}: {e!r}")
+            return False
+    return await game_updated(app, game)
+
+
+async def game_updated(app: web.Application, game: GameData) -> bool:
+    if (broadcaster := app.get(app_keys.sse_broadcaster)) is not None:
+        broadcaster.publish(game)
+    if (exporter := app.get(app_keys.exporter)) is not None:
+        # A failed export only affects this update, the files are written
+        # again on the next one
+        try:
+            await asyncio.to_thread(exporter.export)
+        except Exception as e:
+            print(f"Unable to export {game.game_id}: {e!r}")
+            return False
+    return True
+
+
+@asynccontextmanager
+async def load_games(app: web.Application) -> AsyncGenerator[None]:
+    semaphore = asyncio.Semaphore(app[app_keys.load_concurrency])
+
+    async def _load_games() -> None:
+        try:
+            await asyncio.to_thread(dotnet.load)
+        except Exception as e:
+            print(f"Unable to load PKHeX: {e!r}")
+            raise
+        async with asyncio.TaskGroup() as tg:
+            for game in app[app_keys.games].values():
+                tg.create_task(load_game(app, game, semaphore))
+        startup.mark("ready")
+        print(startup.report())
+
+    app[app_keys.load_task] = asyncio.create_task(_load_games())
+
+    yield
+
+    app[app_keys.load_task].cancel()
+    with suppress(asyncio.CancelledError, Exception):
+        await app[app_keys.load_task]
 
 
 @asynccontextmanager
@@ -33,6 +86,26 @@ async def input_screenshots_thread(app: web.Application) -> AsyncGenerator[None]
 
 @asynccontextmanager
 async def game_file_watches(app: web.Application) -> AsyncGenerator[None]:
+    async def _reload(game: GameData) -> bool:
+        try:
+            return await game.load_data()
+        except OSError:
+            return False
+        except Exception as e:
+            print(f"Unable to load {game.game_id}: {e!r}")
+            return False
+
+    async def _on_reloaded(game: GameData) -> None:
+        await game_updated(app, game)
+
+    scheduler = ReloadScheduler(
+        _reload,
+        _on_reloaded,
+        debounce=app[app_keys.reload_debounce],
+        concurrency=app[app_keys.load_concurrency],
+    )
+    app[app_keys.reload_scheduler] = scheduler
+
     async def _game_files_watches() -> None:
         games = app[app_keys.games].values()
         paths = set()
@@ -40,21 +113,16 @@ async def game_file_watches(app: web.Application) -> AsyncGenerator[None]:
             paths.add(game.save_path)
             paths.update(game.other_saves_paths)
         async for changes in watchfiles.awatch(*paths, recursive=False):
-            changed_files = {x[1] for x in changes}
-            async with asyncio.TaskGroup() as tg:
-                for game in games:
-                    for file in changed_files:
-                        file_path = Path(file)
-                        try:
-                            if any(
-                                file_path.is_relative_to(x)
-                                for x in (game.save_path, *game.other_saves_paths)
-                            ):
-                                await game.load_data()
-                                tg.create_task(send_sse_updates(app, game))
-                                break
-                        except OSError:
-                            pass
+            changed_files = {Path(x[1]) for x in changes}
+            for game in games:
+                # Games that are still loading are reloaded once their initial
+                # load is over, the ones that failed get another attempt
+                if any(
+                    file.is_relative_to(x)
+                    for file in changed_files
+                    for x in (game.save_path, *game.other_saves_paths)
+                ):
+                    scheduler.request(game)
 
     app[app_keys.watches_task] = asyncio.create_task(_game_files_watches())
 
@@ -63,6 +131,7 @@ async def game_file_watches(app: web.Application) -> AsyncGenerator[None]:
     app[app_keys.watches_task].cancel()
     with suppress(asyncio.CancelledError):
         await app[app_keys.watches_task]
+    await scheduler.close()
 
 
 async def add_headers(
@@ -81,44 +150,91 @@ async def add_headers(
 
 
 async def close_sse_streams(app: web.Application) -> None:
+    await app[app_keys.sse_broadcaster].close()
+
+
+async def export_games(app: web.Application) -> bool:
+    semaphore = asyncio.Semaphore(app[app_keys.load_concurrency])
+    await asyncio.to_thread(dotnet.load)
     async with asyncio.TaskGroup() as tg:
-        streams = app[app_keys.sse_streams].keys()
-        for stream in set(streams):
-            stream.stop_streaming()
-            tg.create_task(stream.wait())
+        tasks = [
+            tg.create_task(load_game(app, game, semaphore))
+            for game in app[app_keys.games].values()
+        ]
+    if not all(x.result() for x in tasks):
+        print(f"Export to {app[app_keys.exporter].path} is incomplete")
+        return False
+    print(f"Exported to {app[app_keys.exporter].path}")
+    return True
 
 
 def main() -> None:
+    startup.mark("import")
+
+    parser = argparse.ArgumentParser(prog="livingdex")
+    subparsers = parser.add_subparsers(dest="command")
+    export_parser = subparsers.add_parser(
+        "export", help="write the pages and their data to a directory, then exit"
+    )
+    export_parser.add_argument("path", nargs="?", type=Path)
+    args = parser.parse_args()
+
     env = Env()
     env.read_env()
 
-    port = env.int("PORT")
+    load_concurrency = env.int("LOAD_CONCURRENCY", default=4)
+    reload_debounce = env.float("RELOAD_DEBOUNCE", default=0.2)
+    sse_send_timeout = env.float("SSE_SEND_TIMEOUT", default=10)
+    initial_boxes = env.int("INITIAL_BOXES", default=4)
     data_path = Path(__file__).parent.parent.parent
     if data_path_ := env.str("DATA_PATH", default=""):
         data_path = Path(data_path_)
     data_path = data_path.resolve()
+    export_path = args.path if args.command == "export" else None
+    if export_path is None and (export_path_ := env.str("EXPORT_PATH", default="")):
+        export_path = Path(export_path_)
+    if export_path is None and args.command == "export":
+        export_path = data_path / "export"
 
     app = web.Application()
     app[app_keys.data_path] = data_path
+    app[app_keys.load_concurrency] = load_concurrency
+    app[app_keys.reload_debounce] = reload_debounce
+    app[app_keys.initial_boxes] = initial_boxes
+    app[app_keys.page_cache] = pages.PageCache()
 
     aiohttp_jinja2.setup(app, loader=jinja2.PackageLoader("livingdex"))
     app.add_routes(routes)
 
     app[aiohttp_jinja2.static_root_key] = "/static"
-    app.router.add_static("/static", Path(__file__).parent / "static", name="static")
+    app.router.add_static("/static", export.STATIC_PATH, name="static")
 
     with (data_path / "games.toml").open("rb") as f:
-        app[app_keys.games] = {
+        games = {
             k: GameData(game_id=k, **v, base_path=data_path)
             for k, v in tomllib.load(f).items()
         }
+    app[app_keys.games] = games
+
+    if export_path is not None:
+        app[app_keys.exporter] = export.Exporter(app, games, export_path.resolve())
 
+    if args.command == "export":
+        if not asyncio.run(export_games(app)):
+            sys.exit(1)
+        return
+
+    port = env.int("PORT")
+
+    app.cleanup_ctx.append(load_games)
     app.cleanup_ctx.append(input_screenshots_thread)
     app.cleanup_ctx.append(game_file_watches)
 
     app.on_response_prepare.append(add_headers)
 
-    app[app_keys.sse_streams] = weakref.WeakKeyDictionary()
+    app[app_keys.sse_broadcaster] = sse.Broadcaster(
+        games, send_timeout=sse_send_timeout
+    )
     app.on_shutdown.append(close_sse_streams)
 
     web.run_app(app, port=port)
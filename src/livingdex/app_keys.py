@@ -1,15 +1,20 @@
 import asyncio
-import weakref
 from pathlib import Path
 
-import aiohttp_sse
 from aiohttp import web
 
+from livingdex import export, pages, sse
 from livingdex.game_data import GameData
+from livingdex.reload_scheduler import ReloadScheduler
 
 data_path = web.AppKey("data_path", Path)
+exporter = web.AppKey("exporter", export.Exporter)
 games = web.AppKey("games", dict[str, GameData])
-sse_streams = web.AppKey(
-    "sse_streams", weakref.WeakKeyDictionary[aiohttp_sse.EventSourceResponse, str]
-)
+initial_boxes = web.AppKey("initial_boxes", int)
+load_concurrency = web.AppKey("load_concurrency", int)
+load_task = web.AppKey("load_task", asyncio.Task[None])
+page_cache = web.AppKey("page_cache", pages.PageCache)
+reload_debounce = web.AppKey("reload_debounce", float)
+reload_scheduler = web.AppKey("reload_scheduler", ReloadScheduler[GameData])
+sse_broadcaster = web.AppKey("sse_broadcaster", sse.Broadcaster)
 watches_task = web.AppKey("watches_task", asyncio.Task[None])
@@ -1,12 +1,52 @@
 # mypy: disable-error-code="import-untyped,import-not-found"
-# ruff: noqa: E402
 
 
-import pythonnet
+import threading
+from typing import TYPE_CHECKING, Any
 
-pythonnet.load("coreclr", runtime_version="10.0")
-import clr
-import System as System
+from livingdex import startup
 
-clr.AddReference("PKHeX.Core")
-import PKHeX as PKHeX
+_lock = threading.Lock()
+_loaded: dict[str, Any] = {}
+
+
+def load() -> None:
+    if _loaded:
+        return
+
+    with _lock:
+        if _loaded:
+            return
+
+        with startup.phase("clr_load"):
+            import pythonnet
+
+            pythonnet.load("coreclr", runtime_version="10.0")
+            import clr
+            import System
+
+        with startup.phase("assembly_load"):
+            pkhex_core = clr.AddReference("PKHeX.Core")
+            import PKHeX
+
+        _loaded.update(System=System, PKHeX=PKHeX, pkhex_core=pkhex_core)
+
+
+class _Lazy:
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        load()
+        return getattr(_loaded[self._name], attr)
+
+
+if TYPE_CHECKING:
+    import PKHeX as PKHeX
+    import System as System
+else:
+    # The runtime is only started the first time one of these is accessed
+    System = _Lazy("System")
+    PKHeX = _Lazy("PKHeX")
+
+pkhex_core = _Lazy("pkhex_core")
@@ -0,0 +1,104 @@
+import enum
+
+from livingdex.dotnet import PKHeX, System
+from livingdex.pkm import PKM
+
+
+class EncounterKind(enum.Flag):
+    NONE = 0
+    EGG = enum.auto()
+    EVENT = enum.auto()
+    # The encounter is the Pokemon itself, or a form it can change into
+    DIRECT = enum.auto()
+    # The Pokemon can be evolved from the encounter
+    EVOLVES_FROM = enum.auto()
+
+    @classmethod
+    def from_encounter(  # type: ignore[no-any-unimported]
+        cls, enc: PKHeX.Core.IEncounterable
+    ) -> EncounterKind:
+        impl = enc.__implementation__
+        kind = cls.NONE
+        if isinstance(impl, PKHeX.Core.IEncounterEgg):
+            kind |= cls.EGG
+        if isinstance(impl, PKHeX.Core.MysteryGift | PKHeX.Core.EncounterOutbreak9) or (
+            isinstance(impl, PKHeX.Core.ITeraRaid9) and impl.IsDistribution
+        ):
+            kind |= cls.EVENT
+        return kind
+
+
+class EncounterIndex:
+    def __init__(  # type: ignore[no-any-unimported]
+        self, context: PKHeX.Core.EntityContext, blank_pkm: PKHeX.Core.PKM
+    ) -> None:
+        self.context = context
+        self._blank_pkm = blank_pkm
+
+        self.versions = [
+            x
+            for x in PKHeX.Core.GameVersion.GetValues(PKHeX.Core.GameVersion)
+            if PKHeX.Core.GameUtil.IsValidSavedVersion(x)
+            and PKHeX.Core.EntityContextExtensions.get_Context(x) == context
+        ]
+
+        self._index: dict[tuple[int, int, bool], frozenset[EncounterKind]] = {}
+        self.generator_runs = 0
+
+    def get(self, pkm: PKM, *, native: bool) -> frozenset[EncounterKind]:
+        key = (pkm.species, pkm.form, native)
+        if (kinds := self._index.get(key)) is None:
+            kinds = self._index[key] = self._generate(pkm, native=native)
+        return kinds
+
+    def _generate(self, pkm: PKM, *, native: bool) -> frozenset[EncounterKind]:
+        self.generator_runs += 1
+
+        blank = self._blank_pkm.Clone()
+        blank.Species = pkm.species
+        blank.Form = pkm.form
+        PKHeX.Core.GenderApplicator.SetSaneGender(blank, None)
+        if (
+            self.context
+            in (PKHeX.Core.EntityContext.Gen6, PKHeX.Core.EntityContext.Gen7)
+            and pkm.species == int(PKHeX.Core.Species.Meowstic)
+            and pkm.form == 1
+        ):
+            blank.Gender = 1
+
+        # Without explicit versions the generator considers every game that can
+        # transfer into the context
+        versions = self.versions if native else []
+        kinds = set()
+        for enc in PKHeX.Core.EncounterMovesetGenerator.GenerateEncounters(
+            blank, System.ReadOnlyMemory[System.UInt16]([]), *versions
+        ):
+            kind = EncounterKind.from_encounter(enc)
+
+            species = enc.Species
+            form = enc.Form
+            if (
+                PKHeX.Core.Species(species)
+                in (
+                    PKHeX.Core.Species.Scatterbug,
+                    PKHeX.Core.Species.Spewpa,
+                    PKHeX.Core.Species.Vivillon,
+                )
+                and form == PKHeX.Core.EncounterUtil.FormVivillon
+                and pkm.form <= PKHeX.Core.Vivillon3DS.MaxWildFormID
+            ) or form == PKHeX.Core.EncounterUtil.FormRandom:
+                form = pkm.form
+
+            if species == pkm.species and (
+                form == pkm.form
+                or PKHeX.Core.FormInfo.IsFormChangeable(
+                    species, form, pkm.form, self.context, self.context
+                )
+            ):
+                kind |= EncounterKind.DIRECT
+            elif pkm.evolves_from(PKM(self.context, species, form)):
+                kind |= EncounterKind.EVOLVES_FROM
+
+            kinds.add(kind)
+
+        return frozenset(kinds)
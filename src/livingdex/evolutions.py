@@ -0,0 +1,47 @@
+import threading
+
+from livingdex import names
+from livingdex.dotnet import PKHeX
+
+
+class EvolutionGraph:
+    def __init__(self, context: PKHeX.Core.EntityContext) -> None:  # type: ignore[no-any-unimported]
+        self.context = context
+        self._tree = PKHeX.Core.EvolutionTree.GetEvolutionTree(context)
+        self._ancestors: dict[tuple[int, int], frozenset[tuple[int, int]]] = {}
+
+    def ancestors(self, species: int, form: int) -> frozenset[tuple[int, int]]:
+        key = (species, form)
+        if (ancestors := self._ancestors.get(key)) is None:
+            ancestors = self._ancestors[key] = self._get_ancestors(species, form)
+        return ancestors
+
+    def _get_ancestors(self, species: int, form: int) -> frozenset[tuple[int, int]]:
+        ancestors = set()
+        for pre in self._tree.Reverse.GetPreEvolutions(species, form):
+            pre_species, pre_form = pre.Item1, pre.Item2
+            ancestors.add((pre_species, pre_form))
+            # Also include every form the pre-evolution can be changed from
+            ancestors.update(
+                (pre_species, other_form)
+                for other_form in range(self._form_count(pre_species))
+                if other_form != pre_form
+                and PKHeX.Core.FormInfo.IsFormChangeable(
+                    pre_species, pre_form, other_form, self.context, self.context
+                )
+            )
+        return frozenset(ancestors)
+
+    def _form_count(self, species: int) -> int:
+        return len(names.get(self.context).forms(species))
+
+
+_graphs: dict[int, EvolutionGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get(context: PKHeX.Core.EntityContext) -> EvolutionGraph:  # type: ignore[no-any-unimported]
+    with _graphs_lock:
+        if (graph := _graphs.get(int(context))) is None:
+            graph = _graphs[int(context)] = EvolutionGraph(context)
+    return graph
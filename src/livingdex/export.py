@@ -0,0 +1,81 @@
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+
+from aiohttp import web
+
+from livingdex import views
+from livingdex.game_data import GameData
+
+STATIC_PATH = Path(__file__).parent / "static"
+
+
+def _write(path: Path, content: str | bytes) -> None:
+    # Files are replaced atomically, readers never see partial writes
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    if isinstance(content, str):
+        tmp_path.write_text(content, encoding="utf-8")
+    else:
+        tmp_path.write_bytes(content)
+    tmp_path.replace(path)
+
+
+class Exporter:
+    def __init__(
+        self, app: web.Application, games: Mapping[str, GameData], path: Path
+    ) -> None:
+        self.app = app
+        self.games = games
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._static_exported = False
+        # Version of each game the exported files were generated from
+        self._versions: dict[str, int] = {}
+
+    def export(self) -> list[str]:
+        with self._lock:
+            if not self._static_exported:
+                for f in STATIC_PATH.rglob("*"):
+                    if f.is_file():
+                        static_file = self.path / "static" / f.relative_to(STATIC_PATH)
+                        _write(static_file, f.read_bytes())
+                self._static_exported = True
+
+            snapshots = {x: self.games[x].snapshot for x in self.games}
+            api_path = self.path / "api" / "games"
+            changed = []
+            for game_id, snapshot in snapshots.items():
+                if snapshot is None or self._versions.get(game_id) == snapshot.version:
+                    continue
+                _write(
+                    self.path / f"{game_id}.html",
+                    views.render_game(
+                        self.app,
+                        self.games,
+                        game_id,
+                        snapshots,
+                        initial_boxes=len(snapshot.statuses),
+                        summary_url="/api/games.json",
+                        link_suffix=".html",
+                    ),
+                )
+                _write(
+                    api_path / f"{game_id}.json",
+                    views.dumps(views.game_summary(self.games[game_id], snapshot)),
+                )
+                _write(
+                    api_path / game_id / "boxes.json",
+                    views.boxes_payload(snapshot, 0, len(snapshot.statuses)),
+                )
+                self._versions[game_id] = snapshot.version
+                changed.append(game_id)
+            if not changed:
+                return []
+
+            _write(
+                self.path / "api" / "games.json",
+                views.dumps(views.games_summary(self.games, snapshots)),
+            )
+            return changed
@@ -1,13 +1,8 @@
 import asyncio
-import functools
-import json
-import time
-from contextlib import suppress
 from pathlib import Path
 
 from livingdex import game_info
-from livingdex.dotnet import PKHeX
-from livingdex.pkm import PKM
+from livingdex.snapshot import GameSnapshot
 
 
 class GameData:
@@ -35,110 +30,78 @@ class GameData:
             self.skipped_pokemon = []
         else:
             self.skipped_pokemon = [
-                (PKHeX.Core.Species(species), form) for species, form in skipped_pokemon
+                (species, form) for species, form in skipped_pokemon
             ]
 
-        self.box_size: int
-        self.expected: list[list[PKM]]
-        self.data: list[list[PKM]]
-        self.other_saves_data: dict[PKM, str]
-        self.timestamp: int
+        # Replaced as a whole on every reload, readers never see partial updates
+        self.snapshot: GameSnapshot | None = None
+        # The initial load and the reloads triggered by file changes never overlap
+        self._load_lock = asyncio.Lock()
 
-        self._load_data(*self._load_game_info())
+        self.reloads_performed = 0
+        self.reloads_skipped = 0
 
-    @functools.cached_property
-    def caught(self) -> int:
-        return sum(
-            1
-            for box_id, box in enumerate(self.expected)
-            for pokemon_id, pokemon in enumerate(box)
-            if pokemon
-            and len(self.data) > box_id
-            and len(self.data[box_id]) > pokemon_id
-            and pokemon == self.data[box_id][pokemon_id]
-        )
-
-    @functools.cached_property
-    def total(self) -> int:
-        return sum(1 for box in self.expected for pokemon in box if pokemon)
-
-    @functools.cached_property
-    def json_data(self) -> str:
-        data = []
-        for box_id, box in enumerate(self.expected):
-            box_data = []
-            for pokemon_id, pokemon in enumerate(box):
-                if pokemon:
-                    data_pokemon = self.data[box_id][pokemon_id]
-                    if (
-                        len(self.data) > box_id
-                        and len(self.data[box_id]) > pokemon_id
-                        and data_pokemon
-                    ):
-                        if pokemon == data_pokemon:
-                            box_data.append("caught")
-                        elif pokemon.evolves_from(data_pokemon):
-                            box_data.append(f"evo|{data_pokemon}")
-                        elif pokemon in self.other_saves_data:
-                            box_data.append(
-                                "wrong-and-other-game|"
-                                f"{data_pokemon} / {self.other_saves_data[pokemon]}"
-                            )
-                        else:
-                            box_data.append(f"wrong|{data_pokemon}")
-                    elif pokemon in self.other_saves_data:
-                        box_data.append(f"other-game|{self.other_saves_data[pokemon]}")
-                    else:
-                        box_data.append("missing")
-                else:
-                    box_data.append("filler")
-            data.append(box_data)
+    @property
+    def loaded(self) -> bool:
+        return self.snapshot is not None
 
-        return json.dumps(data)
-
-    async def load_data(self) -> None:
-        save, other_saves = await asyncio.to_thread(self._load_game_info)
-        self._load_data(save, other_saves)
-
-    def _load_data(
-        self, save: game_info.GameInfo, other_saves: dict[str, game_info.GameInfo]
-    ) -> None:
-        self.box_size = save.box_slot_count
-
-        self.expected = save.boxable_forms
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "reloads_performed": self.reloads_performed,
+            "reloads_skipped": self.reloads_skipped,
+        }
 
-        self.data = save.box_data
-        self.other_saves_data = {}
-        self._load_other_save_data(save, self.save_path.stem, main_save=True)
-        for save_name, other_save in other_saves.items():
-            self._load_other_save_data(other_save, save_name)
+    async def load_data(self) -> bool:
+        # Everything, including the derived properties, is computed in a worker
+        # thread to keep the event loop responsive
+        async with self._load_lock:
+            if not await asyncio.to_thread(self._reload):
+                self.reloads_skipped += 1
+                return False
 
-        for attr in dir(self):
-            if isinstance(getattr(type(self), attr, None), functools.cached_property):
-                with suppress(AttributeError):
-                    delattr(self, attr)
+        self.reloads_performed += 1
+        return True
 
-        self.timestamp = int(time.time())
+    def _reload(self) -> bool:
+        # Files are often rewritten without changes, those reloads are skipped
+        if (loaded := self._load_game_info()) is None:
+            return False
 
-    def _load_other_save_data(
-        self, save: game_info.GameInfo, name: str, *, main_save: bool = False
-    ) -> None:
-        for box_number, box_data in enumerate((save.party_data, *save.box_data)):
-            pokemon_location = "Party" if box_number == 0 else f"Box {box_number}"
-            for pokemon in box_data:
-                if pokemon and pokemon not in self.other_saves_data:
-                    if not main_save:
-                        pokemon_location = f"{name} ({pokemon_location})"
-                    self.other_saves_data[pokemon] = pokemon_location
+        self.snapshot = GameSnapshot.build(self.snapshot, self.save_path.stem, *loaded)
+        return True
 
     def _load_game_info(
         self,
-    ) -> tuple[game_info.GameInfo, dict[str, game_info.GameInfo]]:
-        save = game_info.load(self.base_path, self.save_path, self.skipped_pokemon)
+    ) -> (
+        tuple[
+            game_info.GameInfo,
+            dict[str, game_info.GameInfo],
+            dict[Path, game_info.Fingerprint],
+        ]
+        | None
+    ):
+        fingerprints = {
+            path: game_info.fingerprint(path)
+            for path in (self.save_path, *self.other_saves_paths)
+        }
+        if self.snapshot is not None and fingerprints == self.snapshot.fingerprints:
+            return None
+
+        save = game_info.load_cached(
+            self.base_path,
+            self.save_path,
+            self.skipped_pokemon,
+            save_fingerprint=fingerprints[self.save_path],
+        )
         other_saves = {
-            other_save_path.stem: game_info.load(
-                self.base_path, other_save_path, self.skipped_pokemon
+            other_save_path.stem: game_info.load_cached(
+                self.base_path,
+                other_save_path,
+                [],
+                with_layout=False,
+                save_fingerprint=fingerprints[other_save_path],
             )
             for other_save_path in self.other_saves_paths
         }
-        return save, other_saves
+        return save, other_saves, fingerprints
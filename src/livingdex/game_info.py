@@ -1,31 +1,46 @@
+import copy
 import functools
+import hashlib
 import itertools
 import json
 import math
+import threading
 from abc import abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import Self
 
+from livingdex import layouts, obtainability, startup
 from livingdex.dotnet import PKHeX
+from livingdex.obtainability import Obtainability
 from livingdex.pkm import PKM, LGPEStarterPKM
 
 
 class GameInfo:
-    def __init__(  # type: ignore[no-any-unimported]
+    def __init__(
         self,
         base_path: Path,
         game_path: Path,
-        skipped_pokemon: list[tuple[PKHeX.Core.Species, int]],
+        skipped_pokemon: list[tuple[int, int]],
     ) -> None:
         self._base_path = base_path
         self._game_path = game_path
         self.skipped_pokemon = skipped_pokemon
-        self._empty_slot = PKM(self, 0, 0)
         self._save_file = self._load_save_file()
+        self._empty_slot = PKM(self.context, 0, 0)
 
     @abstractmethod
     def _load_save_file(self) -> PKHeX.Core.SaveFile: ...  # type: ignore[no-any-unimported]
 
+    def with_skipped_pokemon(self, skipped_pokemon: list[tuple[int, int]]) -> Self:
+        # Skipped Pokemon only affect the layout, the copy shares the parsed
+        # save and its slots
+        game_info = copy.copy(self)
+        game_info.skipped_pokemon = skipped_pokemon
+        for attr in ("layout_key", "layout"):
+            game_info.__dict__.pop(attr, None)
+        return game_info
+
     @property
     def blank_pkm(self) -> PKHeX.Core.PKM:  # type: ignore[no-any-unimported]
         return self._save_file.BlankPKM
@@ -38,6 +53,10 @@ class GameInfo:
     def context(self) -> PKHeX.Core.EntityContext:  # type: ignore[no-any-unimported]
         return self._save_file.Context
 
+    @functools.cached_property
+    def obtainability(self) -> Obtainability:
+        return obtainability.get(self.context, self.blank_pkm)
+
     @property
     def personal(self) -> PKHeX.Core.IPersonalTable:  # type: ignore[no-any-unimported]
         return self._save_file.Personal
@@ -58,23 +77,57 @@ class GameInfo:
     @abstractmethod
     def box_data(self) -> list[list[PKM]]: ...
 
+    # Cached, names are looked up in the layout for every slot
     @functools.cached_property
+    def layout_key(self) -> layouts.LayoutKey:
+        return (
+            type(self._save_file).__name__,
+            int(self.context),
+            # Japanese and international saves of some games share their class
+            self.box_count,
+            self.box_slot_count,
+            tuple(sorted(self.skipped_pokemon)),
+        )
+
+    @functools.cached_property
+    def layout(self) -> layouts.Layout:
+        return layouts.get(
+            self.layout_key, lambda: layouts.Layout(self._load_boxable_forms())
+        )
+
+    @property
     def boxable_forms(self) -> list[list[PKM]]:
+        return self.layout.boxes
+
+    def _load_boxable_forms(self) -> list[list[PKM]]:
+        if (cached := layouts.read(self._base_path, self.layout_key)) is not None:
+            return [[PKM.from_dict(self.context, x) for x in box] for box in cached]
+
+        with startup.phase("layout_build"):
+            boxable_forms = self._compute_boxable_forms()
+        layouts.write(
+            self._base_path,
+            self.layout_key,
+            [[x.to_dict() for x in box] for box in boxable_forms],
+        )
+        return boxable_forms
+
+    def _compute_boxable_forms(self) -> list[list[PKM]]:
         data: list[PKM] = []
         personal = self._save_file.Personal
 
         if isinstance(self._save_file, PKHeX.Core.SAV7b):
-            data.append(LGPEStarterPKM(self))
+            data.append(LGPEStarterPKM(self.context))
 
         for species_id in range(1, personal.MaxSpeciesID + 1):
             if not personal.IsSpeciesInGame(species_id):
                 continue
-            form0 = PKM(self, species_id, 0)
-            if form0.is_valid:
+            form0 = PKM(self.context, species_id, 0)
+            if self.is_valid(form0):
                 data.extend(form0.forms_with_arguments)
             for form_id in range(1, len(form0.all_forms)):
-                form = PKM(self, species_id, form_id)
-                if form.is_valid and form not in data:
+                form = PKM(self.context, species_id, form_id)
+                if self.is_valid(form) and form not in data:
                     data.extend(form.forms_with_arguments)
 
         sections: dict[  # type: ignore[no-any-unimported]
@@ -104,7 +157,7 @@ class GameInfo:
                         data_regional_dexes[dex_id].append((dex_index, pkm))
                         break
                 else:
-                    if pkm.is_obtainable():
+                    if self.is_obtainable(pkm):
                         data_other.append(pkm)
 
             total_boxes = sum(
@@ -116,7 +169,7 @@ class GameInfo:
                     x
                     for _, x in sorted(
                         dex_data,
-                        key=lambda x: (x[0], not x[1].is_local_form),
+                        key=lambda x: (x[0], not self.is_local_form(x[1])),
                     )
                 )
                 if total_boxes > self.box_slot_count:
@@ -137,10 +190,81 @@ class GameInfo:
             list(x) for x in itertools.batched(data, self.box_slot_count, strict=False)
         ]
 
+    def is_valid(self, pkm: PKM) -> bool:
+        if (
+            not self.personal.IsPresentInGame(pkm.species, pkm.form)
+            or PKHeX.Core.FormInfo.IsBattleOnlyForm(
+                pkm.species, pkm.form, self.generation
+            )
+            or PKHeX.Core.FormInfo.IsFusedForm(pkm.species, pkm.form, self.generation)
+            or PKHeX.Core.FormInfo.IsTotemForm(pkm.species, pkm.form, self.context)
+            or not self.is_obtainable(
+                pkm, allow_transfers=self.generation < 8, allow_events=True
+            )
+        ):
+            return False
+
+        if self.context == PKHeX.Core.EntityContext.Gen7b and (
+            LGPEStarterPKM.is_starter(pkm.species, pkm.form)
+        ):
+            return False
+
+        return (pkm.species, pkm.form) not in self.skipped_pokemon
+
+    def is_obtainable(
+        self, pkm: PKM, *, allow_transfers: bool = False, allow_events: bool = False
+    ) -> bool:
+        return self.obtainability.is_obtainable(
+            pkm, allow_transfers=allow_transfers, allow_events=allow_events
+        )
+
+    def is_local_form(self, pkm: PKM) -> bool:
+        species = PKHeX.Core.Species(pkm.species)
+        info = self.personal[pkm.species, pkm.form]
+
+        is_local = (
+            info.RegionalFormIndex == info.LocalFormIndex
+            if info.IsRegionalForm
+            else False
+        )
+
+        if self.context == PKHeX.Core.EntityContext.Gen8 and (
+            (species, pkm.form)
+            in [
+                (PKHeX.Core.Species.Weezing, 1),
+                (PKHeX.Core.Species.Stunfisk, 1),
+                (PKHeX.Core.Species.Articuno, 1),
+                (PKHeX.Core.Species.Zapdos, 1),
+                (PKHeX.Core.Species.Moltres, 1),
+            ]
+        ):
+            # Sword / Shield: some regional forms don't have the IsRegionalForm flag set
+            is_local = True
+
+        if self.context == PKHeX.Core.EntityContext.Gen8a and (
+            (species, pkm.form) == (PKHeX.Core.Species.Sneasel, 1)
+        ):
+            # Arceus: Sneasel is the only Pokemon with more than one regional form
+            is_local = True
+
+        if self.context == PKHeX.Core.EntityContext.Gen9a and (
+            (species, pkm.form)
+            in [
+                (PKHeX.Core.Species.Farfetchd, 1),
+                (PKHeX.Core.Species.Yamask, 1),
+                (PKHeX.Core.Species.MrMime, 1),
+            ]
+        ):
+            # ZA: some galarian forms are erroneously set as local
+            is_local = False
+
+        return is_local
+
 
 class PKHeXGameInfo(GameInfo):
     def _load_save_file(self) -> PKHeX.Core.SaveFile:  # type: ignore[no-any-unimported]
-        return PKHeX.Core.SaveUtil.GetSaveFile(str(self._game_path))
+        with startup.phase("first_save_load"):
+            return PKHeX.Core.SaveUtil.GetSaveFile(str(self._game_path))
 
     @property
     def box_count(self) -> int:
@@ -158,18 +282,41 @@ class PKHeXGameInfo(GameInfo):
 
     @functools.cached_property
     def party_data(self) -> list[PKM]:
-        return [PKM.from_pkhex(self, pkm) for pkm in self._save_file.PartyData]
+        return self._to_pkms(self._save_file.PartyData)
 
     @functools.cached_property
     def box_data(self) -> list[list[PKM]]:
-        data = [
-            [PKM.from_pkhex(self, pkm) for pkm in self._save_file.GetBoxData(box_id)]
-            for box_id in range(self._save_file.BoxCount)
-        ]
+        # BoxData returns every slot of every box with a single call
+        data = self._to_pkms(self._save_file.BoxData)
 
         if isinstance(self._save_file, PKHeX.Core.SAV7b):
-            data = [[x for box in data for x in box]]
+            return [data]
+
+        return [
+            list(x)
+            for x in itertools.batched(data, self._save_file.BoxSlotCount, strict=False)
+        ]
+
+    def _to_pkms(  # type: ignore[no-any-unimported]
+        self, pkms: Iterable[PKHeX.Core.PKM]
+    ) -> list[PKM]:
+        # Every slot of a save has the same type, so the interface check is done once
+        has_form_argument = isinstance(self.blank_pkm, PKHeX.Core.IFormArgument)
 
+        data = []
+        for pkm in pkms:
+            if not (species := pkm.Species):
+                data.append(self._empty_slot)
+                continue
+            data.append(
+                PKM(
+                    self.context,
+                    species,
+                    pkm.Form,
+                    pkm.FormArgument if has_form_argument else 0,
+                    pkm.IsEgg,
+                )
+            )
         return data
 
 
@@ -178,17 +325,17 @@ class ScreenshotsGameInfo(PKHeXGameInfo):
         self,
         base_path: Path,
         game_path: Path,
-        skipped_pokemon: list[tuple[PKHeX.Core.Species, int]],
+        skipped_pokemon: list[tuple[int, int]],
         *,
         game_version: PKHeX.Core.GameVersion,
     ) -> None:
         self.game_version = game_version
 
-        self._egg_slot = PKM(self, 0, 0, is_egg=True)
-        self._unknown_slot = PKM(self, 0, 0, is_unknown=True)
-
         super().__init__(base_path, game_path, skipped_pokemon)
 
+        self._egg_slot = PKM(self.context, 0, 0, is_egg=True)
+        self._unknown_slot = PKM(self.context, 0, 0, is_unknown=True)
+
     def _load_save_file(self) -> PKHeX.Core.SaveFile:  # type: ignore[no-any-unimported]
         return PKHeX.Core.BlankSaveFile.Get(self.game_version)
 
@@ -215,16 +362,18 @@ class ScreenshotsGameInfo(PKHeXGameInfo):
                     elif pkm_args is None:
                         box_data.append(self._unknown_slot)
                     else:
-                        box_data.append(PKM(self, *pkm_args))
+                        box_data.append(PKM(self.context, *pkm_args))
             data.append(box_data)
 
         return data
 
 
-def load(  # type: ignore[no-any-unimported]
+def load(
     base_path: Path,
     save_path: Path,
-    skipped_pokemon: list[tuple[PKHeX.Core.Species, int]],
+    skipped_pokemon: list[tuple[int, int]],
+    *,
+    with_layout: bool = True,
 ) -> GameInfo:
     if save_path.is_file():
         game_info: GameInfo = PKHeXGameInfo(base_path, save_path, skipped_pokemon)
@@ -239,9 +388,62 @@ def load(  # type: ignore[no-any-unimported]
             game_version=game_version,
         )
 
-    # Pre-cache all cached properties
+    # Pre-cache all cached properties, the layout is only built when needed
     for attr in dir(game_info):
-        if isinstance(getattr(type(game_info), attr, None), functools.cached_property):
+        if attr not in {"layout_key", "layout"} and isinstance(
+            getattr(type(game_info), attr, None), functools.cached_property
+        ):
             getattr(game_info, attr)
 
+    if with_layout:
+        game_info.layout  # noqa: B018
+
+    return game_info
+
+
+type Fingerprint = tuple[tuple[str, bytes], ...]
+
+_cache: dict[Path, tuple[Fingerprint, GameInfo]] = {}
+_cache_locks: dict[Path, threading.Lock] = {}
+_cache_lock = threading.Lock()
+
+
+def fingerprint(save_path: Path) -> Fingerprint:
+    files = [save_path] if save_path.is_file() else sorted(save_path.iterdir())
+    digests = []
+    for file in files:
+        if file.is_file():
+            with file.open("rb") as f:
+                digests.append((file.name, hashlib.file_digest(f, "blake2b").digest()))
+    return tuple(digests)
+
+
+def load_cached(
+    base_path: Path,
+    save_path: Path,
+    skipped_pokemon: list[tuple[int, int]],
+    *,
+    with_layout: bool = True,
+    save_fingerprint: Fingerprint | None = None,
+) -> GameInfo:
+    # Saves are shared by every game referencing them, and only parsed again
+    # when their files change
+    with _cache_lock:
+        path_lock = _cache_locks.setdefault(save_path, threading.Lock())
+
+    with path_lock:
+        current_fingerprint = save_fingerprint or fingerprint(save_path)
+        cached = _cache.get(save_path)
+        if cached is not None and cached[0] == current_fingerprint:
+            game_info = cached[1]
+        else:
+            game_info = load(base_path, save_path, [], with_layout=False)
+            _cache[save_path] = (current_fingerprint, game_info)
+
+    if skipped_pokemon:
+        game_info = game_info.with_skipped_pokemon(skipped_pokemon)
+
+    if with_layout:
+        game_info.layout  # noqa: B018
+
     return game_info
@@ -4,6 +4,7 @@ import json
 import shutil
 from abc import abstractmethod
 from collections import defaultdict
+from collections.abc import Sequence
 from contextlib import suppress
 from pathlib import Path
 from threading import Event
@@ -11,7 +12,7 @@ from threading import Event
 import watchfiles
 from PIL import Image, ImageChops, ImageFile
 
-from livingdex.dotnet import PKHeX
+from livingdex import names
 from livingdex.game_data import GameData
 from livingdex.pkm import PKM
 
@@ -32,10 +33,15 @@ class InputScreenshots:
 
         self.stop_event = stop_event
 
+        # Screenshots are matched against the expected layouts, the ones of
+        # games that are not loaded yet are kept until they are
+        self.loaded_games: set[str] = set()
+
         self.load_all()
         self.setup_watches()
 
     def load_all(self) -> None:
+        self.loaded_games = {x.game_id for x in self.games.values() if x.loaded}
         for f in sorted(self.input_path.glob("*.jpg")):
             if self.stop_event.is_set():
                 return
@@ -50,16 +56,20 @@ class InputScreenshots:
                     continue
 
                 game = next(x for x in self.games.values() if x.save_dir == game_icon)
+                snapshot = game.snapshot
+                if snapshot is None or game.game_id not in self.loaded_games:
+                    continue
                 box_id = int(box_number) - 1
+                all_expected = snapshot.expected
                 try:
-                    expected = game.expected[box_id]
+                    expected = all_expected[box_id]
                 except IndexError:
-                    expected = []
+                    expected = ()
                 box_sprites = self.box_sprites.identify_all(
                     im, game_icon, box_id, expected
                 )
 
-            if box_id < len(game.expected):
+            if box_id < len(all_expected):
                 (game.save_path / f"{box_number}.json").write_text(
                     json.dumps(box_sprites), encoding="utf-8"
                 )
@@ -77,7 +87,14 @@ class InputScreenshots:
                 not Path(x).resolve().is_relative_to(self.unnamed_path)
             ),
             stop_event=self.stop_event,
+            rust_timeout=1000,
+            yield_on_timeout=True,
         ):
+            if not changes and self.loaded_games == {
+                x.game_id for x in self.games.values() if x.loaded
+            }:
+                continue
+
             classes: set[BaseSprites] = set()
             for _, file in changes:
                 parent_dir = Path(file).parent
@@ -222,13 +239,7 @@ class BoxSprites(BaseSprites):
             return (-1, 0, 0)
 
         parts = name.split("_")
-        try:
-            species = next(
-                i
-                for i, x in enumerate(PKHeX.Core.GameInfo.Strings.Species)
-                if x == parts[0]
-            )
-        except StopIteration:
+        if (species := names.species_ids().get(parts[0])) is None:
             return None
 
         if len(parts) >= 2 and parts[1] in ("m", "f"):
@@ -247,7 +258,7 @@ class BoxSprites(BaseSprites):
         return (species, form, form_argument)
 
     def identify_all(
-        self, im: Image.Image, game_icon: str, box_id: int, expected: list[PKM]
+        self, im: Image.Image, game_icon: str, box_id: int, expected: Sequence[PKM]
     ) -> list[tuple[int, int, int] | None]:
         data = []
         x1, y1, x2, y2 = self.sprite_coords
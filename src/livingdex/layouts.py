@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import json
+import threading
+from collections.abc import Callable
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from livingdex import dotnet
+from livingdex.pkm import PKM, LGPEStarterPKM
+
+# Bump this whenever the way layouts are computed or serialized changes
+CACHE_VERSION = 2
+
+type LayoutKey = tuple[str, int, int, int, tuple[tuple[int, int], ...]]
+type SerializedLayout = list[list[dict[str, Any] | None]]
+
+
+class Layout:
+    def __init__(self, boxes: list[list[PKM]]) -> None:
+        self.boxes = boxes
+
+        species_forms: dict[int, set[int]] = {}
+        for box in boxes:
+            for pkm in box:
+                if pkm.species:
+                    species_forms.setdefault(pkm.species, set()).add(pkm.form)
+        self.species_forms = {k: frozenset(v) for k, v in species_forms.items()}
+
+        # Slots expecting each form, to find the ones affected by a change
+        self.positions: dict[PKM, list[tuple[int, int]]] = {}
+        self.unindexed_positions: list[tuple[int, int]] = []
+        for box_id, box in enumerate(boxes):
+            for slot_id, pkm in enumerate(box):
+                if not pkm:
+                    continue
+                if isinstance(pkm, LGPEStarterPKM):
+                    # Matches several forms, so it can't be used as a key
+                    self.unindexed_positions.append((box_id, slot_id))
+                else:
+                    self.positions.setdefault(pkm, []).append((box_id, slot_id))
+
+        self._names = {
+            (pkm.species, pkm.form, pkm.form_argument): self._get_display_name(pkm)
+            for box in boxes
+            for pkm in box
+            if pkm.species and not pkm.is_egg
+        }
+
+    def only_form(self, pkm: PKM) -> bool:
+        return self.species_forms.get(pkm.species, frozenset()) <= {pkm.form}
+
+    def display_name(self, pkm: PKM) -> str:
+        if not pkm.species or pkm.is_egg:
+            return str(pkm)
+        key = (pkm.species, pkm.form, pkm.form_argument)
+        if (name := self._names.get(key)) is None:
+            name = self._get_display_name(pkm)
+        return name
+
+    def _get_display_name(self, pkm: PKM) -> str:
+        # The form name is only shown when other forms of the species are boxable
+        if self.only_form(pkm):
+            return pkm.species_name
+        return str(pkm)
+
+
+_registry: dict[LayoutKey, Layout] = {}
+_registry_locks: dict[LayoutKey, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def get(key: LayoutKey, compute: Callable[[], Layout]) -> Layout:
+    if (layout := _registry.get(key)) is not None:
+        return layout
+
+    with _registry_lock:
+        key_lock = _registry_locks.setdefault(key, threading.Lock())
+
+    # Only one thread computes a given layout, the others wait for its result
+    with key_lock:
+        if (layout := _registry.get(key)) is None:
+            layout = _registry[key] = compute()
+
+    return layout
+
+
+@functools.cache
+def pkhex_digest() -> str:
+    with Path(dotnet.pkhex_core.Location).open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _cache_file(base_path: Path, key: LayoutKey) -> Path:
+    key_digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+    return base_path / "cache" / "layouts" / f"{key[0]}-{key_digest[:16]}.json"
+
+
+def read(base_path: Path, key: LayoutKey) -> SerializedLayout | None:
+    try:
+        with _cache_file(base_path, key).open(encoding="utf-8") as f:
+            data = json.load(f)
+    except OSError, ValueError:
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != CACHE_VERSION
+        or data.get("pkhex") != pkhex_digest()
+        or data.get("key") != json.loads(json.dumps(key))
+    ):
+        return None
+
+    return data["layout"]  # type: ignore[no-any-return]
+
+
+def write(base_path: Path, key: LayoutKey, layout: SerializedLayout) -> None:
+    cache_file = _cache_file(base_path, key)
+    tmp_file = cache_file.with_suffix(".tmp")
+    data = {
+        "version": CACHE_VERSION,
+        "pkhex": pkhex_digest(),
+        "key": key,
+        "layout": layout,
+    }
+    with suppress(OSError):
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        tmp_file.replace(cache_file)
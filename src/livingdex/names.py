@@ -0,0 +1,65 @@
+import functools
+import threading
+
+from livingdex.dotnet import PKHeX
+
+
+@functools.cache
+def species_names() -> tuple[str, ...]:
+    return tuple(PKHeX.Core.GameInfo.Strings.Species)
+
+
+@functools.cache
+def species_ids() -> dict[str, int]:
+    ids: dict[str, int] = {}
+    for species, name in enumerate(species_names()):
+        ids.setdefault(name, species)
+    return ids
+
+
+class NameTable:
+    def __init__(self, context: PKHeX.Core.EntityContext) -> None:  # type: ignore[no-any-unimported]
+        self.context = context
+        self.species = species_names()
+        self.species_ids = species_ids()
+
+        strings = PKHeX.Core.GameInfo.Strings
+        self._forms = tuple(
+            tuple(
+                PKHeX.Core.FormConverter.GetFormList(
+                    species,
+                    strings.Types,
+                    strings.forms,
+                    PKHeX.Core.GameInfo.GenderSymbolUnicode,
+                    context,
+                )
+            )
+            for species in range(len(self.species))
+        )
+
+        arguments_enums = {
+            PKHeX.Core.Species.Alcremie: PKHeX.Core.AlcremieDecoration,
+        }
+        self._form_arguments = {
+            int(species): tuple(enum.GetNames(enum))
+            for species, enum in arguments_enums.items()
+        }
+
+    def forms(self, species: int) -> tuple[str, ...]:
+        if species >= len(self._forms):
+            return ()
+        return self._forms[species]
+
+    def form_arguments(self, species: int) -> tuple[str, ...]:
+        return self._form_arguments.get(species, ())
+
+
+_tables: dict[int, NameTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get(context: PKHeX.Core.EntityContext) -> NameTable:  # type: ignore[no-any-unimported]
+    with _tables_lock:
+        if (table := _tables.get(int(context))) is None:
+            table = _tables[int(context)] = NameTable(context)
+    return table
@@ -0,0 +1,142 @@
+import threading
+
+from livingdex.dotnet import PKHeX
+from livingdex.encounters import EncounterIndex, EncounterKind
+from livingdex.pkm import PKM
+
+
+class Obtainability:
+    def __init__(  # type: ignore[no-any-unimported]
+        self, context: PKHeX.Core.EntityContext, blank_pkm: PKHeX.Core.PKM
+    ) -> None:
+        self.context = context
+        self.encounters = EncounterIndex(context, blank_pkm)
+
+        self._cache: dict[tuple[int, int, bool, bool], bool] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "generator_runs": self.encounters.generator_runs,
+        }
+
+    def is_obtainable(
+        self,
+        pkm: PKM,
+        *,
+        allow_transfers: bool = False,
+        allow_events: bool = False,
+        checked_forms: set[tuple[int, int]] | None = None,
+    ) -> bool:
+        key = (pkm.species, pkm.form, allow_transfers, allow_events)
+        if (result := self._cache.get(key)) is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = self._is_obtainable(
+            pkm,
+            allow_transfers=allow_transfers,
+            allow_events=allow_events,
+            checked_forms=checked_forms,
+        )
+        # A negative result reached while skipping already checked forms only
+        # holds for that specific search, so it can't be reused
+        if checked_forms is None or result:
+            self._cache[key] = result
+        return result
+
+    def _is_obtainable(
+        self,
+        pkm: PKM,
+        *,
+        allow_transfers: bool,
+        allow_events: bool,
+        checked_forms: set[tuple[int, int]] | None,
+    ) -> bool:
+        if (
+            self.context == PKHeX.Core.EntityContext.Gen9
+            and PKHeX.Core.Species(pkm.species) == PKHeX.Core.Species.Gimmighoul
+            and pkm.form == 1
+        ):
+            return True
+
+        if checked_forms is None:
+            checked_forms = set()
+        checked_forms.add((pkm.species, pkm.form))
+
+        kinds = [
+            x
+            for x in self.encounters.get(pkm, native=not allow_transfers)
+            if allow_events or EncounterKind.EVENT not in x
+        ]
+
+        if kinds and all(EncounterKind.EGG in x for x in kinds):
+            tree = PKHeX.Core.EvolutionTree.GetEvolutionTree(self.context)
+            related = [
+                (x.Item1, x.Item2)
+                for x in tree.GetEvolutionsAndPreEvolutions(pkm.species, pkm.form)
+                if (x.Item1, x.Item2) not in checked_forms
+            ]
+            other_parents = {
+                (int(k1), k2): (int(v1), v2)
+                for k1, k2, v1, v2 in (
+                    (PKHeX.Core.Species.NidoranF, 0, PKHeX.Core.Species.NidoranM, 0),
+                    (PKHeX.Core.Species.NidoranM, 0, PKHeX.Core.Species.NidoranF, 0),
+                    (PKHeX.Core.Species.Volbeat, 0, PKHeX.Core.Species.Illumise, 0),
+                    (PKHeX.Core.Species.Illumise, 0, PKHeX.Core.Species.Volbeat, 0),
+                    (PKHeX.Core.Species.Phione, 0, PKHeX.Core.Species.Manaphy, 0),
+                    (PKHeX.Core.Species.Indeedee, 0, PKHeX.Core.Species.Indeedee, 1),
+                    (PKHeX.Core.Species.Indeedee, 1, PKHeX.Core.Species.Indeedee, 0),
+                )
+            }
+            if other_parent := other_parents.get((pkm.species, pkm.form)):
+                related.append(other_parent)
+            return any(
+                self.is_obtainable(
+                    PKM(self.context, species, form),
+                    allow_transfers=allow_transfers,
+                    allow_events=allow_events,
+                    checked_forms=checked_forms,
+                )
+                for species, form in related
+            )
+
+        if any(x & (EncounterKind.DIRECT | EncounterKind.EVOLVES_FROM) for x in kinds):
+            return True
+
+        if aliases := pkm.form_aliases:
+            return any(
+                self.is_obtainable(
+                    PKM(self.context, pkm.species, form),
+                    allow_transfers=allow_transfers,
+                    allow_events=allow_events,
+                    checked_forms=checked_forms,
+                )
+                for form in aliases
+                if form != pkm.form
+            )
+
+        return False
+
+
+_services: dict[int, Obtainability] = {}
+_services_lock = threading.Lock()
+
+
+def get(  # type: ignore[no-any-unimported]
+    context: PKHeX.Core.EntityContext, blank_pkm: PKHeX.Core.PKM
+) -> Obtainability:
+    with _services_lock:
+        if (service := _services.get(int(context))) is None:
+            service = _services[int(context)] = Obtainability(context, blank_pkm)
+    return service
+
+
+def stats() -> dict[str, dict[str, int]]:
+    return {str(service.context): service.stats for service in _services.values()}
@@ -0,0 +1,72 @@
+import dataclasses
+import gzip
+
+from aiohttp import web
+
+
+def not_modified(
+    request: web.Request, etag: str, last_modified: int | None = None
+) -> bool:
+    if request.if_none_match is not None:
+        return any(x.value in {etag, "*"} for x in request.if_none_match)
+    return (
+        last_modified is not None
+        and request.if_modified_since is not None
+        and request.if_modified_since.timestamp() >= last_modified
+    )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Page:
+    etag: str
+    last_modified: int
+    body: bytes
+    gzip_body: bytes
+
+    @classmethod
+    def build(cls, etag: str, last_modified: int, text: str) -> Page:
+        body = text.encode()
+        return cls(etag, last_modified, body, gzip.compress(body, mtime=0))
+
+    def response(self, request: web.Request) -> web.StreamResponse:
+        if not_modified(request, self.etag, self.last_modified):
+            response = web.Response(status=304)
+        elif "gzip" in request.headers.get("Accept-Encoding", ""):
+            response = web.Response(
+                body=self.gzip_body, content_type="text/html", charset="utf-8"
+            )
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = web.Response(
+                body=self.body, content_type="text/html", charset="utf-8"
+            )
+        response.etag = self.etag
+        response.last_modified = self.last_modified
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+class PageCache:
+    def __init__(self) -> None:
+        # Only the page for the latest state of each game is kept
+        self._pages: dict[str, Page] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._pages)}
+
+    def get(self, game_id: str, etag: str) -> Page | None:
+        page = self._pages.get(game_id)
+        if page is None or page.etag != etag:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return page
+
+    def put(self, game_id: str, page: Page) -> Page:
+        self._pages[game_id] = page
+        return page
@@ -1,42 +1,94 @@
-import copy
 from collections.abc import Iterable, Sequence
-from typing import TYPE_CHECKING, Any, Self
+from typing import Any, Self, cast
 
-from livingdex.dotnet import PKHeX, System
+from livingdex import evolutions, names
+from livingdex.dotnet import PKHeX
 
-if TYPE_CHECKING:
-    from livingdex.game_info import GameInfo
+_interned: dict[tuple[object, ...], PKM] = {}
 
 
 class PKM:
-    def __init__(
-        self,
-        game_info: GameInfo,
+    __slots__ = (
+        "_form_argument",
+        "_hash",
+        "context",
+        "form",
+        "form_argument",
+        "is_egg",
+        "is_unknown",
+        "key",
+        "normalized_form",
+        "species",
+    )
+
+    context: PKHeX.Core.EntityContext  # type: ignore[no-any-unimported]
+    species: int
+    form: int
+    _form_argument: int
+    is_egg: bool
+    is_unknown: bool
+
+    form_argument: int
+    normalized_form: int
+    key: tuple[int, int, int]
+    _hash: int
+
+    def __new__(  # type: ignore[no-any-unimported]
+        cls,
+        context: PKHeX.Core.EntityContext,
         species: int,
         form: int,
         form_argument: int = 0,
         is_egg: bool = False,
         is_unknown: bool = False,
-    ) -> None:
-        self.game_info = game_info
+    ) -> Self:
+        # Instances are immutable and interned, identical slots share one object
+        intern_key = (
+            cls,
+            int(context),
+            species,
+            form,
+            form_argument,
+            is_egg,
+            is_unknown,
+        )
+        if (pkm := _interned.get(intern_key)) is not None:
+            return cast("Self", pkm)
+
+        pkm = super().__new__(cls)
+        object.__setattr__(pkm, "context", context)
+        object.__setattr__(pkm, "species", species)
+        object.__setattr__(pkm, "form", form)
+        object.__setattr__(pkm, "_form_argument", form_argument)
+        object.__setattr__(pkm, "is_egg", is_egg)
+        object.__setattr__(pkm, "is_unknown", is_unknown)
+
+        object.__setattr__(
+            pkm, "form_argument", form_argument if pkm.all_form_arguments else 0
+        )
+        object.__setattr__(pkm, "normalized_form", pkm._get_normalized_form())
+        object.__setattr__(pkm, "key", pkm._get_key())
+        object.__setattr__(pkm, "_hash", hash(pkm.key))
+
+        return cast("Self", _interned.setdefault(intern_key, pkm))
 
-        self.species = species
-        self.form = form
-        self._form_argument = form_argument
-        self.is_egg = is_egg
-        self.is_unknown = is_unknown
+    def __setattr__(self, name: str, value: object) -> None:
+        msg = f"{type(self).__name__} objects are immutable"
+        raise AttributeError(msg)
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Self:
+        return self
 
     @classmethod
-    def from_pkhex(  # type: ignore[no-any-unimported]
-        cls, game_info: GameInfo, pkm: PKHeX.Core.PKM
-    ) -> Self:
-        return cls(
-            game_info,
-            pkm.Species,
-            pkm.Form,
-            pkm.FormArgument if isinstance(pkm, PKHeX.Core.IFormArgument) else 0,
-            pkm.IsEgg,
-        )
+    def from_dict(  # type: ignore[no-any-unimported]
+        cls, context: PKHeX.Core.EntityContext, data: dict[str, Any] | None
+    ) -> PKM:
+        if data is None:
+            return LGPEStarterPKM(context)
+        return cls(context, **data)
 
     def to_dict(self) -> dict[str, Any] | None:
         return {
@@ -63,8 +115,7 @@ class PKM:
 
         return None
 
-    @property
-    def normalized_form(self) -> int:
+    def _get_normalized_form(self) -> int:
         if self.ignore_alternate_forms:
             return 0
 
@@ -74,14 +125,12 @@ class PKM:
         return self.form
 
     @property
-    def form_argument(self) -> int:
-        if self.all_form_arguments:
-            return self._form_argument
-        return 0
+    def generation(self) -> int:
+        return PKHeX.Core.EntityContextExtensions.Generation(self.context)  # type: ignore[no-any-return]
 
     @property
     def species_name(self) -> str:
-        return PKHeX.Core.GameInfo.Strings.Species[self.species]  # type: ignore[no-any-return]
+        return names.get(self.context).species[self.species]
 
     @property
     def form_name(self) -> str:
@@ -90,14 +139,6 @@ class PKM:
             form += f" {form_arguments[self.form_argument]}"
         return form
 
-    @property
-    def only_form(self) -> bool:
-        return not any(
-            x.species == self.species and x.form != self.form
-            for box in self.game_info.boxable_forms
-            for x in box
-        )
-
     @property
     def ignore_alternate_forms(self) -> bool:
         ignored_species = [
@@ -108,10 +149,10 @@ class PKM:
             PKHeX.Core.Species.Spewpa,  # Pattern for Vivillon
             PKHeX.Core.Species.Silvally,  # Memories
         ]
-        if self.game_info.generation == 3:
+        if self.generation == 3:
             # Only one form is available, depending on the game being played
             ignored_species.append(PKHeX.Core.Species.Deoxys)
-        if self.game_info.generation <= 6:
+        if self.generation <= 6:
             # Alternate forms revert to the default one when deposited in the PC
             ignored_species.extend(
                 [
@@ -122,268 +163,35 @@ class PKM:
             )
         return PKHeX.Core.Species(self.species) in ignored_species
 
-    @property
-    def is_valid(self) -> bool:
-        if (
-            not self.game_info.personal.IsPresentInGame(self.species, self.form)
-            or PKHeX.Core.FormInfo.IsBattleOnlyForm(
-                self.species, self.form, self.game_info.generation
-            )
-            or PKHeX.Core.FormInfo.IsFusedForm(
-                self.species, self.form, self.game_info.generation
-            )
-            or PKHeX.Core.FormInfo.IsTotemForm(
-                self.species, self.form, self.game_info.context
-            )
-            or not self.is_obtainable(
-                allow_transfers=self.game_info.generation < 8, allow_events=True
-            )
-        ):
-            return False
-
-        if (
-            self.game_info.context == PKHeX.Core.EntityContext.Gen7b
-            and LGPEStarterPKM.is_starter(self.species, self.form)
-        ):
-            return False
-
-        return (
-            PKHeX.Core.Species(self.species),
-            self.form,
-        ) not in self.game_info.skipped_pokemon
-
-    def is_obtainable(
-        self,
-        *,
-        allow_transfers: bool = False,
-        allow_events: bool = False,
-        checked_forms: set[tuple[int, int]] | None = None,
-    ) -> bool:
-        if (
-            self.game_info.context == PKHeX.Core.EntityContext.Gen9
-            and PKHeX.Core.Species(self.species) == PKHeX.Core.Species.Gimmighoul
-            and self.form == 1
-        ):
-            return True
-
-        if checked_forms is None:
-            checked_forms = set()
-        checked_forms.add((self.species, self.form))
-
-        pkm = self.game_info.blank_pkm
-        pkm.Species = self.species
-        pkm.Form = self.form
-        PKHeX.Core.GenderApplicator.SetSaneGender(pkm, None)
-        if (
-            self.game_info.context
-            in (PKHeX.Core.EntityContext.Gen6, PKHeX.Core.EntityContext.Gen7)
-            and self.species == int(PKHeX.Core.Species.Meowstic)
-            and self.form == 1
-        ):
-            pkm.Gender = 1
-
-        versions = []
-        if not allow_transfers:
-            versions = [
-                x
-                for x in PKHeX.Core.GameVersion.GetValues(PKHeX.Core.GameVersion)
-                if PKHeX.Core.GameUtil.IsValidSavedVersion(x)
-                and PKHeX.Core.EntityContextExtensions.get_Context(x)
-                == self.game_info.context
-            ]
-
-        encs = list(
-            PKHeX.Core.EncounterMovesetGenerator.GenerateEncounters(
-                pkm, System.ReadOnlyMemory[System.UInt16]([]), *versions
-            )
-        )
-        if not allow_events:
-            non_event_encs = []
-            for enc in encs:
-                impl = enc.__implementation__
-                if not isinstance(
-                    impl, PKHeX.Core.MysteryGift | PKHeX.Core.EncounterOutbreak9
-                ) and not (
-                    isinstance(impl, PKHeX.Core.ITeraRaid9) and impl.IsDistribution
-                ):
-                    non_event_encs.append(enc)
-            encs = non_event_encs
-
-        if encs and all(
-            isinstance(x.__implementation__, PKHeX.Core.IEncounterEgg) for x in encs
-        ):
-            tree = PKHeX.Core.EvolutionTree.GetEvolutionTree(self.game_info.context)
-            related = [
-                (x.Item1, x.Item2)
-                for x in tree.GetEvolutionsAndPreEvolutions(self.species, self.form)
-                if (x.Item1, x.Item2) not in checked_forms
-            ]
-            other_parents = {
-                (int(k1), k2): (int(v1), v2)
-                for k1, k2, v1, v2 in (
-                    (PKHeX.Core.Species.NidoranF, 0, PKHeX.Core.Species.NidoranM, 0),
-                    (PKHeX.Core.Species.NidoranM, 0, PKHeX.Core.Species.NidoranF, 0),
-                    (PKHeX.Core.Species.Volbeat, 0, PKHeX.Core.Species.Illumise, 0),
-                    (PKHeX.Core.Species.Illumise, 0, PKHeX.Core.Species.Volbeat, 0),
-                    (PKHeX.Core.Species.Phione, 0, PKHeX.Core.Species.Manaphy, 0),
-                    (PKHeX.Core.Species.Indeedee, 0, PKHeX.Core.Species.Indeedee, 1),
-                    (PKHeX.Core.Species.Indeedee, 1, PKHeX.Core.Species.Indeedee, 0),
-                )
-            }
-            if other_parent := other_parents.get((self.species, self.form)):
-                related.append(other_parent)
-            return any(
-                PKM(self.game_info, species, form).is_obtainable(
-                    allow_transfers=allow_transfers,
-                    allow_events=allow_events,
-                    checked_forms=checked_forms,
-                )
-                for species, form in related
-            )
-
-        for enc in encs:
-            species = enc.Species
-            form = enc.Form
-            if (
-                PKHeX.Core.Species(species)
-                in (
-                    PKHeX.Core.Species.Scatterbug,
-                    PKHeX.Core.Species.Spewpa,
-                    PKHeX.Core.Species.Vivillon,
-                )
-                and form == PKHeX.Core.EncounterUtil.FormVivillon
-                and self.form <= PKHeX.Core.Vivillon3DS.MaxWildFormID
-            ) or form == PKHeX.Core.EncounterUtil.FormRandom:
-                form = self.form
-
-            if species == self.species and (
-                form == self.form
-                or PKHeX.Core.FormInfo.IsFormChangeable(
-                    species,
-                    form,
-                    self.form,
-                    self.game_info.context,
-                    self.game_info.context,
-                )
-            ):
-                return True
-
-            if self.evolves_from(PKM(self.game_info, species, form)):
-                return True
-
-        if aliases := self.form_aliases:
-            return any(
-                PKM(self.game_info, self.species, form).is_obtainable(
-                    allow_transfers=allow_transfers,
-                    allow_events=allow_events,
-                    checked_forms=checked_forms,
-                )
-                for form in aliases
-                if form != self.form
-            )
-
-        return False
-
     def get_all_forms(self, context: PKHeX.Core.EntityContext) -> Sequence[str]:  # type: ignore[no-any-unimported]
-        strings = PKHeX.Core.GameInfo.Strings
-        return PKHeX.Core.FormConverter.GetFormList(  # type: ignore[no-any-return]
-            self.species,
-            strings.Types,
-            strings.forms,
-            PKHeX.Core.GameInfo.GenderSymbolUnicode,
-            context,
-        )
+        return names.get(context).forms(self.species)
 
     @property
     def all_forms(self) -> Sequence[str]:
-        return self.get_all_forms(self.game_info.context)
+        return self.get_all_forms(self.context)
 
     @property
     def all_form_arguments(self) -> Sequence[str]:
-        arguments_enums = {
-            PKHeX.Core.Species.Alcremie: PKHeX.Core.AlcremieDecoration,
-        }
-        species = PKHeX.Core.Species(self.species)
-        if species in arguments_enums:
-            enum = arguments_enums[species]
-            return enum.GetNames(enum)  # type: ignore[no-any-return]
-        return []
+        return names.get(self.context).form_arguments(self.species)
 
     @property
-    def forms_with_arguments(self) -> Iterable[Self]:
+    def forms_with_arguments(self) -> Iterable[PKM]:
         yield self
 
         if self.all_form_arguments:
             for form_argument in range(
                 PKHeX.Core.FormArgumentUtil.GetFormArgumentMax(
-                    self.species, self.form, self.game_info.context
+                    self.species, self.form, self.context
                 )
             ):
-                new_form = copy.copy(self)
-                new_form._form_argument = form_argument + 1  # noqa: SLF001
-                yield new_form
-
-    @property
-    def is_local_form(self) -> bool:
-        species = PKHeX.Core.Species(self.species)
-        info = self.game_info.personal[self.species, self.form]
-
-        is_local = (
-            info.RegionalFormIndex == info.LocalFormIndex
-            if info.IsRegionalForm
-            else False
-        )
-
-        if self.game_info.context == PKHeX.Core.EntityContext.Gen8 and (
-            (species, self.form)
-            in [
-                (PKHeX.Core.Species.Weezing, 1),
-                (PKHeX.Core.Species.Stunfisk, 1),
-                (PKHeX.Core.Species.Articuno, 1),
-                (PKHeX.Core.Species.Zapdos, 1),
-                (PKHeX.Core.Species.Moltres, 1),
-            ]
-        ):
-            # Sword / Shield: some regional forms don't have the IsRegionalForm flag set
-            is_local = True
-
-        if self.game_info.context == PKHeX.Core.EntityContext.Gen8a and (
-            (species, self.form) == (PKHeX.Core.Species.Sneasel, 1)
-        ):
-            # Arceus: Sneasel is the only Pokemon with more than one regional form
-            is_local = True
-
-        if self.game_info.context == PKHeX.Core.EntityContext.Gen9a and (
-            (species, self.form)
-            in [
-                (PKHeX.Core.Species.Farfetchd, 1),
-                (PKHeX.Core.Species.Yamask, 1),
-                (PKHeX.Core.Species.MrMime, 1),
-            ]
-        ):
-            # ZA: some galarian forms are erroneously set as local
-            is_local = False
-
-        return is_local
+                yield PKM(self.context, self.species, self.form, form_argument + 1)
 
     def evolves_from(self, other: PKM) -> bool:
         if self.is_egg or other.is_egg or self.is_unknown or other.is_unknown:
             return False
-        tree = PKHeX.Core.EvolutionTree.GetEvolutionTree(self.game_info.context)
-        for pre in tree.Reverse.GetPreEvolutions(self.species, self.form):
-            if pre.Item1 == other.species and (
-                pre.Item2 == other.form
-                or PKHeX.Core.FormInfo.IsFormChangeable(
-                    pre.Item1,
-                    pre.Item2,
-                    other.form,
-                    self.game_info.context,
-                    self.game_info.context,
-                )
-            ):
-                return True
-
-        return False
+        return (other.species, other.form) in evolutions.get(self.context).ancestors(
+            self.species, self.form
+        )
 
     def __str__(self) -> str:
         if self.is_unknown:
@@ -393,7 +201,7 @@ class PKM:
         if self.is_egg:
             return "Egg"
         name = self.species_name
-        if not self.only_form and not self.ignore_alternate_forms and self.form_name:
+        if not self.ignore_alternate_forms and self.form_name:
             name += f" {self.form_name}"
         return name
 
@@ -401,7 +209,7 @@ class PKM:
         cls = type(self)
         return (
             f"{cls.__module__}.{cls.__qualname__}"
-            f"({self.game_info!r}, {self.species!r}, {self.form!r}, "
+            f"({self.context!r}, {self.species!r}, {self.form!r}, "
             f"{self.is_egg!r}, {self.is_unknown!r})"
         )
 
@@ -409,15 +217,16 @@ class PKM:
         return self.species != 0 or self.is_unknown
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return NotImplemented
         return self.key == other.key
 
     def __hash__(self) -> int:
-        return hash(self.key)
+        return self._hash
 
-    @property
-    def key(self) -> tuple[int, int, int]:
+    def _get_key(self) -> tuple[int, int, int]:
         if self.is_egg:
             return (-1, 0, 0)
         if self.is_unknown:
@@ -426,15 +235,20 @@ class PKM:
 
 
 class LGPEStarterPKM(PKM):
-    def __init__(self, game_info: GameInfo) -> None:
-        super().__init__(game_info, 0, 0)
+    __slots__ = ()
+
+    def __new__(cls, context: PKHeX.Core.EntityContext) -> Self:  # type: ignore[no-any-unimported]
+        return super().__new__(cls, context, 0, 0)
+
+    def to_dict(self) -> None:
+        return None
 
     def __str__(self) -> str:
         return "Starter"
 
     def __repr__(self) -> str:
         cls = type(self)
-        return f"{cls.__module__}.{cls.__qualname__}({self.game_info!r})"
+        return f"{cls.__module__}.{cls.__qualname__}({self.context!r})"
 
     def __bool__(self) -> bool:
         return True
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class ReloadStats:
+    def __init__(self) -> None:
+        self.reloads = 0
+        self.superseded = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+
+    def add(self, latency: float) -> None:
+        self.reloads += 1
+        self.last = latency
+        self.max = max(self.max, latency)
+        self.total += latency
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "reloads": self.reloads,
+            "superseded": self.superseded,
+            "last_ms": self.last * 1000,
+            "mean_ms": self.total / self.reloads * 1000 if self.reloads else 0,
+            "max_ms": self.max * 1000,
+        }
+
+
+class ReloadScheduler[T: Hashable]:
+    def __init__(
+        self,
+        reload: Callable[[T], Awaitable[bool]],
+        on_reloaded: Callable[[T], Awaitable[None]],
+        *,
+        debounce: float,
+        concurrency: int,
+    ) -> None:
+        self._reload = reload
+        self._on_reloaded = on_reloaded
+        self._debounce = debounce
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+        self._requested_at: dict[T, float] = {}
+        self._tasks: dict[T, asyncio.Task[None]] = {}
+        self.stats: dict[T, ReloadStats] = {}
+
+    def request(self, item: T) -> None:
+        self._requested_at[item] = time.monotonic()
+        if item not in self._tasks:
+            task = asyncio.create_task(self._run(item))
+            self._tasks[item] = task
+            task.add_done_callback(lambda _: self._forget(item, task))
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _forget(self, item: T, task: asyncio.Task[None]) -> None:
+        # Only needed when the task failed or was cancelled, a newer task for
+        # the same item may have been started since
+        if self._tasks.get(item) is task:
+            del self._tasks[item]
+
+    async def _run(self, item: T) -> None:
+        stats = self.stats.setdefault(item, ReloadStats())
+        changed = False
+        while (requested_at := self._requested_at.pop(item, None)) is not None:
+            # Wait until no new request arrived for the whole debounce period
+            while (delay := requested_at + self._debounce - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+                requested_at = self._requested_at.pop(item, requested_at)
+
+            async with self._semaphore:
+                start = time.perf_counter()
+                try:
+                    changed |= await self._reload(item)
+                finally:
+                    stats.add(time.perf_counter() - start)
+
+            if item in self._requested_at:
+                # Another request arrived in the meantime, only the newest
+                # state is worth publishing
+                stats.superseded += 1
+                continue
+
+            if changed:
+                changed = False
+                await self._on_reloaded(item)
+
+        # Removed without yielding to the event loop after the last check, so
+        # that any later request starts a new task
+        del self._tasks[item]
@@ -1,13 +1,10 @@
-import asyncio
-from collections.abc import Mapping
-from typing import Any
-
 import aiohttp_jinja2
 import aiohttp_sse
 from aiohttp import web
 
-from livingdex import app_keys
+from livingdex import app_keys, obtainability, pages, sse, versions, views
 from livingdex.game_data import GameData
+from livingdex.snapshot import GameSnapshot
 
 routes = web.RouteTableDef()
 
@@ -19,79 +16,203 @@ async def index(request: web.Request) -> web.StreamResponse:
     raise web.HTTPFound(loc)
 
 
+@routes.get("/healthz", name="healthz")
+async def healthz(request: web.Request) -> web.StreamResponse:  # noqa: ARG001
+    return web.json_response({"status": "ok"})
+
+
+@routes.get("/readyz", name="readyz")
+async def readyz(request: web.Request) -> web.StreamResponse:
+    loading = [
+        game_id
+        for game_id, game in request.app[app_keys.games].items()
+        if not game.loaded
+    ]
+    load_task = request.app[app_keys.load_task]
+    if not load_task.done():
+        status = "loading"
+    elif load_task.cancelled() or load_task.exception() is not None:
+        status = "error"
+    else:
+        status = "ok"
+    return web.json_response(
+        {"status": status, "loading": loading},
+        status=200 if status == "ok" else 503,
+    )
+
+
+@routes.get("/stats", name="stats")
+async def stats(request: web.Request) -> web.StreamResponse:
+    reload_stats = {}
+    if scheduler := request.app.get(app_keys.reload_scheduler):
+        reload_stats = scheduler.stats
+
+    return web.json_response(
+        {
+            "games": {
+                game_id: {
+                    **game.stats,
+                    **(reload_stats[game].to_dict() if game in reload_stats else {}),
+                }
+                for game_id, game in request.app[app_keys.games].items()
+            },
+            "pages": request.app[app_keys.page_cache].stats,
+            "sse": request.app[app_keys.sse_broadcaster].stats,
+            "obtainability": obtainability.stats(),
+        }
+    )
+
+
+@routes.get("/api/games", name="api_games")
+async def api_games(request: web.Request) -> web.StreamResponse:
+    all_games = request.app[app_keys.games]
+    snapshots = {x: all_games[x].snapshot for x in all_games}
+    etag = versions.encode(-1 if x is None else x.version for x in snapshots.values())
+    if pages.not_modified(request, etag):
+        return _conditional_response(etag)
+
+    body = views.games_summary(all_games, snapshots)
+    return _conditional_response(etag, views.dumps(body))
+
+
+@routes.get("/api/games/{game_id}", name="api_game")
+async def api_game(request: web.Request) -> web.StreamResponse:
+    game = _get_game(request)
+    snapshot = game.snapshot
+    etag = versions.encode([-1 if snapshot is None else snapshot.version])
+    if pages.not_modified(request, etag):
+        return _conditional_response(etag)
+    body = views.game_summary(game, snapshot)
+    return _conditional_response(etag, views.dumps(body))
+
+
+@routes.get("/api/games/{game_id}/boxes", name="api_boxes")
+async def api_boxes(request: web.Request) -> web.StreamResponse:
+    game = _get_game(request)
+    if (snapshot := game.snapshot) is None:
+        raise web.HTTPServiceUnavailable
+
+    start, end = _box_range(request, snapshot)
+    binary = request.query.get("format") == "binary"
+
+    etag = versions.encode([snapshot.version])
+    if pages.not_modified(request, etag):
+        return _conditional_response(etag)
+
+    if binary:
+        # One byte per slot, boxes are padded with fillers to the same length
+        box_length = snapshot.box_length
+        response = _conditional_response(
+            etag,
+            b"".join(x.ljust(box_length, b"\0") for x in snapshot.statuses[start:end]),
+            "application/octet-stream",
+        )
+        response.headers["X-Box-Size"] = str(box_length)
+        return response
+
+    return _conditional_response(etag, views.boxes_payload(snapshot, start, end))
+
+
+def _box_range(request: web.Request, snapshot: GameSnapshot) -> tuple[int, int]:
+    try:
+        start = int(request.query.get("start", 0))
+        end = int(request.query.get("end", len(snapshot.statuses)))
+    except ValueError:
+        raise web.HTTPBadRequest from None
+    if not 0 <= start <= end <= len(snapshot.statuses):
+        raise web.HTTPBadRequest
+    return start, end
+
+
+def _get_game(request: web.Request) -> GameData:
+    all_games = request.app[app_keys.games]
+    if (game_id := request.match_info["game_id"]) not in all_games:
+        raise web.HTTPNotFound
+    return all_games[game_id]
+
+
+def _conditional_response(
+    etag: str,
+    body: str | bytes | None = None,
+    content_type: str = "application/json",
+) -> web.Response:
+    if body is None:
+        response = web.Response(status=304)
+    elif isinstance(body, str):
+        response = web.Response(text=body, content_type=content_type)
+    else:
+        response = web.Response(body=body, content_type=content_type)
+    response.etag = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @routes.get("/{game_id}", name="game")
-@aiohttp_jinja2.template("game.html")
-async def game(request: web.Request) -> Mapping[str, Any]:
+async def game(request: web.Request) -> web.StreamResponse:
     game_id = request.match_info["game_id"]
     all_games = request.app[app_keys.games]
     if game_id not in all_games:
         raise web.HTTPNotFound
 
-    game = all_games[game_id]
-
-    return {
-        "current_game": game.name,
-        "current_game_id": game_id,
-        "all_games": all_games,
-        "expected_data": game.expected,
-        "game_data": game.data,
-        "other_saves_data": game.other_saves_data,
-        "box_size": game.box_size,
-        "timestamp": max(x.timestamp for x in all_games.values()),
+    # Read once, so that the versions match what is rendered
+    snapshots = {x: all_games[x].snapshot for x in all_games}
+    last_event_id = versions.encode(
+        -1 if x is None else x.version for x in snapshots.values()
+    )
+
+    page_cache = request.app[app_keys.page_cache]
+    if (page := page_cache.get(game_id, last_event_id)) is not None:
+        return page.response(request)
+
+    page = pages.Page.build(
+        last_event_id,
+        max((x.timestamp for x in snapshots.values() if x is not None), default=0),
+        views.render_game(
+            request.app,
+            all_games,
+            game_id,
+            snapshots,
+            initial_boxes=request.app[app_keys.initial_boxes],
+            last_event_id=last_event_id,
+        ),
+    )
+    return page_cache.put(game_id, page).response(request)
+
+
+@routes.get("/{game_id}/boxes", name="boxes")
+async def boxes(request: web.Request) -> web.StreamResponse:
+    game = _get_game(request)
+    if (snapshot := game.snapshot) is None:
+        raise web.HTTPServiceUnavailable
+
+    start, end = _box_range(request, snapshot)
+    etag = versions.encode([snapshot.version])
+    if pages.not_modified(request, etag):
+        return _conditional_response(etag)
+
+    context = {
+        "snapshot": snapshot,
+        "display_name": snapshot.layout.display_name,
+        "box_ids": range(start, end),
     }
-
-
-@routes.get("/sse/{game_id}/{timestamp}", name="sse")
-async def sse(request: web.Request) -> web.StreamResponse:
-    async with aiohttp_sse.sse_response(request) as stream:
-        game_id = request.match_info["game_id"]
-        if stream.last_event_id:
-            timestamp = int(stream.last_event_id.partition("-")[0])
-        else:
-            timestamp = int(request.match_info["timestamp"])
-        request.app[app_keys.sse_streams][stream] = game_id
-        try:
-            async with asyncio.TaskGroup() as tg:
-                for game in request.app[app_keys.games].values():
-                    if game.timestamp > timestamp:
-                        tg.create_task(
-                            send_sse_updates(request.app, game, {(stream, game_id)})
-                        )
-            await stream.wait()
-
-        finally:
-            del request.app[app_keys.sse_streams][stream]
+    return _conditional_response(
+        etag,
+        aiohttp_jinja2.render_string("boxes.html", request, context),
+        "text/html",
+    )
+
+
+@routes.get("/sse/{game_id}/{last_event_id}", name="sse")
+async def sse_stream(request: web.Request) -> web.StreamResponse:
+    async with aiohttp_sse.sse_response(
+        request, response_cls=sse.EventStream
+    ) as stream:
+        all_games = request.app[app_keys.games]
+        known_versions = versions.decode(
+            stream.last_event_id or request.match_info["last_event_id"], all_games
+        )
+        await request.app[app_keys.sse_broadcaster].serve(
+            stream, request.match_info["game_id"], known_versions
+        )
 
     return stream
-
-
-async def _send_update(
-    stream: aiohttp_sse.EventSourceResponse, msg: str, timestamp: int, event: str
-) -> None:
-    try:
-        await stream.send(msg, f"{timestamp}-{event}", event)
-    except OSError as e:
-        print(e)
-
-
-async def send_sse_updates(
-    app: web.Application,
-    game: GameData,
-    streams: set[tuple[aiohttp_sse.EventSourceResponse, str]] | None = None,
-) -> None:
-    if streams is None:
-        streams = set(app[app_keys.sse_streams].items())
-    async with asyncio.TaskGroup() as tg:
-        for stream, game_id in streams:
-            tg.create_task(
-                _send_update(
-                    stream,
-                    f"{game.game_id}|{game.caught}|{game.total}",
-                    game.timestamp,
-                    "caught",
-                )
-            )
-            if game_id == game.game_id:
-                tg.create_task(
-                    _send_update(stream, game.json_data, game.timestamp, "boxes")
-                )
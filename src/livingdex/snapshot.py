@@ -0,0 +1,355 @@
+import dataclasses
+import enum
+import itertools
+import json
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import Self
+
+from livingdex import game_info, layouts
+from livingdex.pkm import PKM
+
+# Number of diffs kept to bring reconnecting clients up to date
+DIFF_LOG_SIZE = 64
+
+type Box = tuple[PKM, ...]
+# Box, slot, status code and text id
+type SlotChange = tuple[int, int, int, int]
+
+
+class SlotStatus(enum.IntEnum):
+    # The codes are sent to the client, main.js has to be kept in sync
+    FILLER = 0
+    MISSING = 1
+    CAUGHT = 2
+    EVO = 3
+    WRONG = 4
+    WRONG_AND_OTHER_GAME = 5
+    OTHER_GAME = 6
+
+    @property
+    def css_name(self) -> str:
+        return self.name.lower().replace("_", "-")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SlotDiff:
+    version: int
+    # None when the whole grid has to be considered changed (first load or a
+    # different layout), in which case no individual changes are listed
+    base_version: int | None
+    changes: tuple[SlotChange, ...]
+
+    @property
+    def full(self) -> bool:
+        return self.base_version is None
+
+
+class _TextTable:
+    def __init__(self, texts: tuple[str, ...] = ("",)) -> None:
+        # Id 0 is reserved for slots without a text
+        self.texts = list(texts)
+        self._index = {text: text_id for text_id, text in enumerate(texts)}
+
+    def intern(self, text: str | None) -> int:
+        if text is None:
+            return 0
+        if (text_id := self._index.get(text)) is None:
+            text_id = self._index[text] = len(self.texts)
+            self.texts.append(text)
+        return text_id
+
+
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class GameSnapshot:
+    version: int
+    timestamp: int
+    fingerprints: Mapping[Path, game_info.Fingerprint]
+    save_info: game_info.GameInfo
+    layout: layouts.Layout
+    box_size: int
+    expected: tuple[Box, ...]
+    data: tuple[Box, ...]
+    other_saves_data: Mapping[PKM, str]
+    # One status code per slot, with the ids of their texts in the text table
+    statuses: tuple[bytes, ...]
+    text_ids: tuple[tuple[int, ...], ...]
+    texts: tuple[str, ...]
+    texts_payload: str
+    diff: SlotDiff
+    recent_diffs: tuple[SlotDiff, ...]
+    caught: int
+    total: int
+    box_payloads: tuple[str, ...]
+    json_data: str
+
+    @classmethod
+    def build(
+        cls,
+        previous: Self | None,
+        main_save_name: str,
+        save: game_info.GameInfo,
+        other_saves: dict[str, game_info.GameInfo],
+        fingerprints: dict[Path, game_info.Fingerprint],
+    ) -> Self:
+        version = 0 if previous is None else previous.version + 1
+        layout = save.layout
+        data = tuple(tuple(box) for box in save.box_data)
+
+        other_saves_data: dict[PKM, str] = {}
+        _add_other_save_data(other_saves_data, save, main_save_name, main_save=True)
+        for save_name, other_save in other_saves.items():
+            _add_other_save_data(other_saves_data, other_save, save_name)
+
+        if previous is None or previous.layout is not layout:
+            expected = tuple(tuple(box) for box in layout.boxes)
+            text_table = _TextTable()
+            statuses_list = []
+            text_ids_list = []
+            for box_id, box in enumerate(expected):
+                box_statuses = bytearray()
+                box_text_ids = []
+                for slot_id, pokemon in enumerate(box):
+                    status, text = _slot_status(
+                        layout, pokemon, box_id, slot_id, data, other_saves_data
+                    )
+                    box_statuses.append(status)
+                    box_text_ids.append(text_table.intern(text))
+                statuses_list.append(bytes(box_statuses))
+                text_ids_list.append(tuple(box_text_ids))
+            statuses = tuple(statuses_list)
+            text_ids = tuple(text_ids_list)
+
+            diff = SlotDiff(version, None, ())
+            caught = sum(box.count(SlotStatus.CAUGHT) for box in statuses)
+            total = sum(len(box) - box.count(SlotStatus.FILLER) for box in statuses)
+            box_payloads = tuple(
+                _box_payload(*box) for box in zip(statuses, text_ids, strict=True)
+            )
+        else:
+            expected = previous.expected
+            text_table = _TextTable(previous.texts)
+            changes: list[SlotChange] = []
+            caught = previous.caught
+            for box_id, slot_id in sorted(
+                _affected_slots(previous, data, other_saves_data)
+            ):
+                status, text = _slot_status(
+                    layout,
+                    expected[box_id][slot_id],
+                    box_id,
+                    slot_id,
+                    data,
+                    other_saves_data,
+                )
+                text_id = text_table.intern(text)
+                old_status = previous.statuses[box_id][slot_id]
+                old_text_id = previous.text_ids[box_id][slot_id]
+                if (status, text_id) != (old_status, old_text_id):
+                    changes.append((box_id, slot_id, status, text_id))
+                    caught += (status == SlotStatus.CAUGHT) - (
+                        old_status == SlotStatus.CAUGHT
+                    )
+            diff = SlotDiff(version, previous.version, tuple(changes))
+            total = previous.total
+
+            # Only the boxes containing changed slots are rebuilt
+            new_statuses = list(previous.statuses)
+            new_text_ids = list(previous.text_ids)
+            new_payloads = list(previous.box_payloads)
+            for box_id, box_changes in itertools.groupby(changes, lambda x: x[0]):
+                box_statuses = bytearray(new_statuses[box_id])
+                box_text_ids = list(new_text_ids[box_id])
+                for _, slot_id, slot_status, text_id in box_changes:
+                    box_statuses[slot_id] = slot_status
+                    box_text_ids[slot_id] = text_id
+                new_statuses[box_id] = bytes(box_statuses)
+                new_text_ids[box_id] = tuple(box_text_ids)
+                new_payloads[box_id] = _box_payload(
+                    new_statuses[box_id], new_text_ids[box_id]
+                )
+            statuses = tuple(new_statuses)
+            text_ids = tuple(new_text_ids)
+            box_payloads = tuple(new_payloads)
+
+            # Texts no slot uses any more are dropped once they outnumber the
+            # ones in use, every payload is then rebuilt with the new ids
+            if len(text_table.texts) > 2 * len({0}.union(*text_ids)):
+                compacted = _TextTable()
+                text_ids = tuple(
+                    tuple(compacted.intern(text_table.texts[x]) for x in box)
+                    for box in text_ids
+                )
+                diff = SlotDiff(
+                    version,
+                    previous.version,
+                    tuple(
+                        (box_id, slot_id, slot_status, text_ids[box_id][slot_id])
+                        for box_id, slot_id, slot_status, _ in diff.changes
+                    ),
+                )
+                text_table = compacted
+                box_payloads = tuple(
+                    _box_payload(*box) for box in zip(statuses, text_ids, strict=True)
+                )
+
+        texts = tuple(text_table.texts)
+        texts_payload = _dumps(texts)
+        return cls(
+            version=version,
+            timestamp=int(time.time()),
+            fingerprints=MappingProxyType(fingerprints),
+            save_info=save,
+            layout=layout,
+            box_size=save.box_slot_count,
+            expected=expected,
+            data=data,
+            other_saves_data=MappingProxyType(other_saves_data),
+            statuses=statuses,
+            text_ids=text_ids,
+            texts=texts,
+            texts_payload=texts_payload,
+            diff=diff,
+            recent_diffs=(
+                (diff,)
+                if previous is None or diff.full
+                else (*previous.recent_diffs[-DIFF_LOG_SIZE + 1 :], diff)
+            ),
+            caught=caught,
+            total=total,
+            box_payloads=box_payloads,
+            json_data=f'{{"texts":{texts_payload},"boxes":[{",".join(box_payloads)}]}}',
+        )
+
+    @property
+    def box_length(self) -> int:
+        # Slots in the longest box, box_size is only the number of columns
+        # for games showing all their slots in a single box
+        return max(map(len, self.statuses), default=0)
+
+    def slot(self, box_id: int, slot_id: int) -> tuple[SlotStatus, str]:
+        return (
+            SlotStatus(self.statuses[box_id][slot_id]),
+            self.texts[self.text_ids[box_id][slot_id]],
+        )
+
+    def changes_since(self, version: int) -> list[SlotChange] | None:
+        # None means the changes are no longer known and everything must be resent
+        if version == self.version:
+            return []
+        diffs = [x for x in self.recent_diffs if x.version > version]
+        if not diffs or diffs[0].base_version != version:
+            return None
+        # Only the slots are taken from the diffs, the text ids of older ones
+        # may refer to texts dropped from the table since
+        slots = {change[:2] for diff in diffs for change in diff.changes}
+        return [
+            (
+                box_id,
+                slot_id,
+                self.statuses[box_id][slot_id],
+                self.text_ids[box_id][slot_id],
+            )
+            for box_id, slot_id in sorted(slots)
+        ]
+
+    def changes_payload(self, changes: list[SlotChange]) -> str:
+        # Texts are sent inline, clients only know the table of the full grid
+        return _dumps(
+            [
+                [box_id, slot_id, status, self.texts[text_id]]
+                if text_id
+                else [box_id, slot_id, status]
+                for box_id, slot_id, status, text_id in changes
+            ]
+        )
+
+
+def _dumps(obj: object) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _box_payload(statuses: bytes, text_ids: tuple[int, ...]) -> str:
+    return _dumps(
+        [
+            [status, text_id] if text_id else status
+            for status, text_id in zip(statuses, text_ids, strict=True)
+        ]
+    )
+
+
+def _affected_slots(
+    previous: GameSnapshot,
+    data: tuple[Box, ...],
+    other_saves_data: Mapping[PKM, str],
+) -> set[tuple[int, int]]:
+    affected = set()
+
+    # Interned PKM objects make identity checks enough to spot moved Pokemon
+    for box_id, box in enumerate(previous.expected):
+        old_box = previous.data[box_id] if box_id < len(previous.data) else ()
+        new_box = data[box_id] if box_id < len(data) else ()
+        for slot_id, (old, new) in enumerate(itertools.zip_longest(old_box, new_box)):
+            if slot_id >= len(box):
+                break
+            if old is not new:
+                affected.add((box_id, slot_id))
+
+    # Locations in other saves only matter for the slots expecting those forms
+    if other_saves_data != previous.other_saves_data:
+        layout = previous.layout
+        for pokemon in previous.other_saves_data.keys() | other_saves_data.keys():
+            if previous.other_saves_data.get(pokemon) != other_saves_data.get(pokemon):
+                affected.update(layout.positions.get(pokemon, ()))
+        affected.update(layout.unindexed_positions)
+
+    return affected
+
+
+def _add_other_save_data(
+    other_saves_data: dict[PKM, str],
+    save: game_info.GameInfo,
+    name: str,
+    *,
+    main_save: bool = False,
+) -> None:
+    for box_number, box_data in enumerate((save.party_data, *save.box_data)):
+        pokemon_location = "Party" if box_number == 0 else f"Box {box_number}"
+        for pokemon in box_data:
+            if pokemon and pokemon not in other_saves_data:
+                if not main_save:
+                    pokemon_location = f"{name} ({pokemon_location})"
+                other_saves_data[pokemon] = pokemon_location
+
+
+def _slot_status(
+    layout: layouts.Layout,
+    pokemon: PKM,
+    box_id: int,
+    pokemon_id: int,
+    data: tuple[Box, ...],
+    other_saves_data: Mapping[PKM, str],
+) -> tuple[SlotStatus, str | None]:
+    if not pokemon:
+        return SlotStatus.FILLER, None
+
+    data_pokemon = None
+    if len(data) > box_id and len(data[box_id]) > pokemon_id:
+        data_pokemon = data[box_id][pokemon_id]
+
+    if data_pokemon:
+        if pokemon == data_pokemon:
+            return SlotStatus.CAUGHT, None
+        if pokemon.evolves_from(data_pokemon):
+            return SlotStatus.EVO, layout.display_name(data_pokemon)
+        if pokemon in other_saves_data:
+            return (
+                SlotStatus.WRONG_AND_OTHER_GAME,
+                f"{layout.display_name(data_pokemon)} / {other_saves_data[pokemon]}",
+            )
+        return SlotStatus.WRONG, layout.display_name(data_pokemon)
+    if pokemon in other_saves_data:
+        return SlotStatus.OTHER_GAME, other_saves_data[pokemon]
+    return SlotStatus.MISSING, None
@@ -0,0 +1,172 @@
+import asyncio
+from collections.abc import Callable, Mapping
+from contextlib import suppress
+
+import aiohttp_sse
+
+from livingdex import versions
+from livingdex.game_data import GameData
+from livingdex.snapshot import GameSnapshot
+
+
+class EventStream(aiohttp_sse.EventSourceResponse):
+    async def send_encoded(self, event_id: str, event: bytes) -> None:
+        await self.write(f"id: {event_id}{self.DEFAULT_SEPARATOR}".encode() + event)
+
+
+def encode_event(event: str, data: str) -> bytes:
+    # Payloads are always serialized on a single line
+    sep = EventStream.DEFAULT_SEPARATOR
+    return f"event: {event}{sep}data: {data}{sep}{sep}".encode()
+
+
+class Subscriber:
+    def __init__(
+        self, stream: EventStream, game_id: str, known_versions: dict[str, int]
+    ) -> None:
+        self.stream = stream
+        self.game_id = game_id
+        # Version of every game the client is known to be displaying
+        self.versions = known_versions
+
+        # Games with updates still to be sent, only their latest version is sent
+        self.pending = dict.fromkeys(known_versions)
+        self.wake = asyncio.Event()
+        self.wake.set()
+
+    def event_id(self) -> str:
+        return versions.encode(self.versions.values())
+
+
+class Broadcaster:
+    def __init__(self, games: Mapping[str, GameData], *, send_timeout: float) -> None:
+        self.games = games
+        self.send_timeout = send_timeout
+
+        self._subscribers: set[Subscriber] = set()
+        # Encoded events of the latest version of each game
+        self._encoded: dict[str, tuple[int, dict[tuple[str, int], bytes]]] = {}
+
+        self.published = 0
+        self.coalesced = 0
+        self.encoded = 0
+        self.sent = 0
+        self.dropped = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "queue_depth": sum(len(x.pending) for x in self._subscribers),
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "encoded": self.encoded,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+    def publish(self, game: GameData) -> None:
+        self.published += 1
+        for subscriber in self._subscribers:
+            if game.game_id in subscriber.pending:
+                self.coalesced += 1
+            else:
+                subscriber.pending[game.game_id] = None
+                subscriber.wake.set()
+
+    async def serve(
+        self, stream: EventStream, game_id: str, known_versions: dict[str, int]
+    ) -> None:
+        subscriber = Subscriber(stream, game_id, known_versions)
+        self._subscribers.add(subscriber)
+        sender = asyncio.create_task(self._send_pending(subscriber))
+        try:
+            await stream.wait()
+        finally:
+            self._subscribers.discard(subscriber)
+            sender.cancel()
+            with suppress(asyncio.CancelledError):
+                await sender
+
+    async def close(self) -> None:
+        async with asyncio.TaskGroup() as tg:
+            for subscriber in set(self._subscribers):
+                subscriber.stream.stop_streaming()
+                tg.create_task(subscriber.stream.wait())
+
+    async def _send_pending(self, subscriber: Subscriber) -> None:
+        while True:
+            await subscriber.wake.wait()
+            subscriber.wake.clear()
+            while subscriber.pending:
+                game_id = next(iter(subscriber.pending))
+                del subscriber.pending[game_id]
+                for event_id, event in self._updates(subscriber, self.games[game_id]):
+                    try:
+                        async with asyncio.timeout(self.send_timeout):
+                            await subscriber.stream.send_encoded(event_id, event)
+                    except TimeoutError, OSError:
+                        # Slow clients are disconnected instead of holding back
+                        # the others, they resync from their last event id
+                        self.dropped += 1
+                        subscriber.stream.stop_streaming()
+                        return
+                    self.sent += 1
+
+    def _updates(
+        self, subscriber: Subscriber, game: GameData
+    ) -> list[tuple[str, bytes]]:
+        snapshot = game.snapshot
+        known_version = subscriber.versions.get(game.game_id, -1)
+        if snapshot is None or known_version == snapshot.version:
+            return []
+
+        caught = self._encode(
+            game.game_id,
+            snapshot,
+            "caught",
+            -1,
+            lambda: f"{game.game_id}|{snapshot.caught}|{snapshot.total}",
+        )
+        if subscriber.game_id != game.game_id:
+            subscriber.versions[game.game_id] = snapshot.version
+            return [(subscriber.event_id(), caught)]
+
+        # The new version is only acknowledged together with the boxes, clients
+        # that missed too many versions get the whole grid again
+        caught_id = subscriber.event_id()
+        subscriber.versions[game.game_id] = snapshot.version
+        changes = snapshot.changes_since(known_version)
+        if changes is None:
+            boxes = self._encode(
+                game.game_id, snapshot, "boxes", -1, lambda: snapshot.json_data
+            )
+        elif changes:
+            boxes = self._encode(
+                game.game_id,
+                snapshot,
+                "boxes-delta",
+                known_version,
+                lambda: snapshot.changes_payload(changes),
+            )
+        else:
+            return [(subscriber.event_id(), caught)]
+        return [(caught_id, caught), (subscriber.event_id(), boxes)]
+
+    def _encode(
+        self,
+        game_id: str,
+        snapshot: GameSnapshot,
+        event: str,
+        base_version: int,
+        data: Callable[[], str],
+    ) -> bytes:
+        version, encoded = self._encoded.get(game_id, (None, {}))
+        if version != snapshot.version:
+            encoded = {}
+            self._encoded[game_id] = (snapshot.version, encoded)
+        if (payload := encoded.get((event, base_version))) is None:
+            payload = encode_event(event, data())
+            encoded[event, base_version] = payload
+            self.encoded += 1
+        return payload
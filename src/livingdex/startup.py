@@ -0,0 +1,31 @@
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from livingdex import started_at
+
+phases: dict[str, float] = {}
+
+
+def mark(name: str, since: float = started_at) -> None:
+    phases.setdefault(name, time.perf_counter() - since)
+
+
+@contextmanager
+def phase(name: str) -> Generator[None]:
+    # Only the first occurrence of each phase is recorded
+    if name in phases:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        mark(name, start)
+
+
+def report() -> str:
+    return "Startup: " + ", ".join(
+        f"{name} {duration * 1000:.0f}ms" for name, duration in phases.items()
+    )
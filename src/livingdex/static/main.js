@@ -1,36 +1,183 @@
-function connect(timestamp) {
+// Indexed by the status codes sent by the server
+const SLOT_STATUSES = [
+  "filler",
+  "missing",
+  "caught",
+  "evo",
+  "wrong",
+  "wrong-and-other-game",
+  "other-game",
+];
+
+function connect(lastEventId) {
   const url = new URL(document.location.href);
-  url.pathname = `/sse${url.pathname}/${timestamp}`;
+  url.pathname = `/sse${url.pathname}/${lastEventId}`;
   const sse = new EventSource(url);
   sse.addEventListener("boxes", onSseBoxes);
+  sse.addEventListener("boxes-delta", onSseBoxesDelta);
   sse.addEventListener("caught", onSseCaught);
 }
 
 function onSseBoxes(event) {
-  const data = JSON.parse(event.data);
+  if (document.querySelector("main").dataset.loading !== undefined) {
+    // The game finished loading, render the full page
+    document.location.reload();
+    return;
+  }
+  const { texts, boxes } = JSON.parse(event.data);
   const boxElements = document.querySelectorAll("main .box");
-  for (const [boxId, box] of data.entries()) {
-    const slotElements = boxElements[boxId].querySelectorAll(".box-content > div");
+  if (boxes.length !== boxElements.length) {
+    // The layout changed, render the full page
+    document.location.reload();
+    return;
+  }
+  for (const [boxId, box] of boxes.entries()) {
+    const slotElements = getSlotElements(boxElements[boxId]);
+    if (!slotElements) {
+      continue;
+    }
     for (const [slotId, slot] of box.entries()) {
-      const el = slotElements[slotId];
-      const [status, text] = slot.split("|");
-      el.dataset.slotStatus = status;
-      if (text) {
-        el.dataset.smallText = text;
-      } else {
-        delete el.dataset.smallText;
-      }
+      const [status, textId] = Array.isArray(slot) ? slot : [slot, 0];
+      updateSlot(slotElements[slotId], status, texts[textId]);
     }
   }
 }
 
+function onSseBoxesDelta(event) {
+  const data = JSON.parse(event.data);
+  const boxElements = document.querySelectorAll("main .box");
+  for (const [boxId, slotId, status, text] of data) {
+    const slotElements = getSlotElements(boxElements[boxId]);
+    if (slotElements) {
+      updateSlot(slotElements[slotId], status, text);
+    }
+  }
+}
+
+function getSlotElements(boxElement) {
+  // Boxes not loaded yet are fetched with their latest state instead
+  if (boxElement.dataset.pending !== undefined) {
+    if (boxElement.dataset.pending === "loading") {
+      boxElement.dataset.pending = "stale";
+    }
+    return null;
+  }
+  return boxElement.querySelectorAll(".box-content > div");
+}
+
+function updateSlot(el, status, text) {
+  el.dataset.slotStatus = SLOT_STATUSES[status];
+  if (text) {
+    el.dataset.smallText = text;
+  } else {
+    delete el.dataset.smallText;
+  }
+}
+
 function onSseCaught(event) {
   const [gameId, caughtNumber, totalNumber] = event.data.split("|");
+  setCaughtNumbers(gameId, caughtNumber, totalNumber);
+}
+
+function setCaughtNumbers(gameId, caughtNumber, totalNumber) {
   document.querySelector(`#game-${gameId} a small`).textContent =
     `(${caughtNumber} / ${totalNumber})`;
 }
 
+async function loadSummary(url) {
+  // Exported pages are only rewritten when their own game changes
+  const response = await fetch(url);
+  if (!response.ok) {
+    return;
+  }
+  const { games } = await response.json();
+  for (const [gameId, game] of Object.entries(games)) {
+    if (game.loaded) {
+      setCaughtNumbers(gameId, game.caught, game.total);
+    }
+  }
+}
+
+const boxObserver = new IntersectionObserver(onBoxesVisible, {
+  rootMargin: "100% 0px",
+});
+
+function onBoxesVisible(entries) {
+  const boxElements = [];
+  for (const entry of entries) {
+    if (entry.isIntersecting) {
+      boxObserver.unobserve(entry.target);
+      boxElements.push(entry.target);
+    }
+  }
+  loadBoxes(boxElements);
+}
+
+function loadBoxes(boxElements) {
+  // Consecutive boxes are fetched together
+  boxElements.sort((a, b) => a.dataset.boxId - b.dataset.boxId);
+  let group = [];
+  for (const el of boxElements) {
+    if (group.length && el.dataset.boxId - group.at(-1).dataset.boxId !== 1) {
+      loadBoxGroup(group);
+      group = [];
+    }
+    group.push(el);
+  }
+  if (group.length) {
+    loadBoxGroup(group);
+  }
+}
+
+async function loadBoxGroup(boxElements) {
+  const main = document.querySelector("main");
+  const url = new URL(main.dataset.boxesUrl, document.location.href);
+  url.searchParams.set("start", boxElements[0].dataset.boxId);
+  url.searchParams.set("end", Number(boxElements.at(-1).dataset.boxId) + 1);
+  for (const el of boxElements) {
+    el.dataset.pending = "loading";
+  }
+
+  let html;
+  try {
+    const response = await fetch(url);
+    if (!response.ok) {
+      throw new Error(response.statusText);
+    }
+    html = await response.text();
+  } catch {
+    // Retried the next time the boxes become visible
+    for (const el of boxElements) {
+      el.dataset.pending = "";
+      boxObserver.observe(el);
+    }
+    return;
+  }
+
+  const template = document.createElement("template");
+  template.innerHTML = html;
+  const staleBoxElements = [];
+  for (const section of template.content.querySelectorAll(".box")) {
+    const el = boxElements.find((x) => x.dataset.boxId === section.dataset.boxId);
+    if (el.dataset.pending === "stale") {
+      // Updated while the request was in flight
+      staleBoxElements.push(section);
+    }
+    el.replaceWith(section);
+  }
+  loadBoxes(staleBoxElements);
+}
+
+for (const el of document.querySelectorAll("main .box[data-pending]")) {
+  boxObserver.observe(el);
+}
+
 const hash = new URL(import.meta.url).hash;
 if (hash) {
   connect(hash.substring(1));
 }
+
+const summaryUrl = document.querySelector("header").dataset.summaryUrl;
+if (summaryUrl) {
+  loadSummary(summaryUrl);
+}
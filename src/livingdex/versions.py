@@ -0,0 +1,19 @@
+import secrets
+from collections.abc import Iterable
+from contextlib import suppress
+
+# Versions start from zero in every process, the epoch tells them apart
+EPOCH = secrets.token_hex(4)
+
+
+def encode(versions: Iterable[int]) -> str:
+    return ".".join((EPOCH, *map(str, versions)))
+
+
+def decode(value: str, game_ids: Iterable[str]) -> dict[str, int]:
+    game_ids = list(game_ids)
+    epoch, *versions = value.split(".")
+    if epoch == EPOCH and len(versions) == len(game_ids):
+        with suppress(ValueError):
+            return dict(zip(game_ids, map(int, versions), strict=True))
+    return dict.fromkeys(game_ids, -1)
@@ -0,0 +1,82 @@
+import json
+from collections.abc import Mapping
+from typing import Any
+
+import aiohttp_jinja2
+from aiohttp import web
+
+from livingdex.game_data import GameData
+from livingdex.snapshot import GameSnapshot
+
+# Shared by the server and the static export
+
+
+def game_summary(game: GameData, snapshot: GameSnapshot | None) -> dict[str, Any]:
+    if snapshot is None:
+        return {"name": game.name, "loaded": False}
+    return {
+        "name": game.name,
+        "loaded": True,
+        "version": snapshot.version,
+        "caught": snapshot.caught,
+        "total": snapshot.total,
+        "boxes": len(snapshot.statuses),
+        "box_size": snapshot.box_length,
+        "columns": snapshot.box_size,
+    }
+
+
+def games_summary(
+    all_games: Mapping[str, GameData], snapshots: Mapping[str, GameSnapshot | None]
+) -> dict[str, Any]:
+    loaded = [x for x in snapshots.values() if x is not None]
+    return {
+        "caught": sum(x.caught for x in loaded),
+        "total": sum(x.total for x in loaded),
+        "games": {
+            game_id: game_summary(all_games[game_id], snapshot)
+            for game_id, snapshot in snapshots.items()
+        },
+    }
+
+
+def boxes_payload(snapshot: GameSnapshot, start: int, end: int) -> str:
+    return (
+        f'{{"version":{snapshot.version},"start":{start},'
+        f'"texts":{snapshot.texts_payload},'
+        f'"boxes":[{",".join(snapshot.box_payloads[start:end])}]}}'
+    )
+
+
+def dumps(obj: object) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def render_game(
+    app: web.Application,
+    all_games: Mapping[str, GameData],
+    game_id: str,
+    snapshots: Mapping[str, GameSnapshot | None],
+    *,
+    initial_boxes: int,
+    last_event_id: str | None = None,
+    summary_url: str | None = None,
+    link_suffix: str = "",
+) -> str:
+    snapshot = snapshots[game_id]
+    context: dict[str, Any] = {
+        "app": app,
+        "current_game": all_games[game_id].name,
+        "current_game_id": game_id,
+        "all_games": all_games,
+        "snapshots": snapshots,
+        "loading": snapshot is None,
+        "last_event_id": last_event_id,
+        "summary_url": summary_url,
+        "link_suffix": link_suffix,
+    }
+    if snapshot is not None:
+        context["snapshot"] = snapshot
+        context["display_name"] = snapshot.layout.display_name
+        context["initial_boxes"] = initial_boxes
+    return aiohttp_jinja2.get_env(app).get_template("game.html").render(context)
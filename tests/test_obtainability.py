@@ -0,0 +1,180 @@
+import pytest
+
+from livingdex.dotnet import PKHeX, System
+from livingdex.obtainability import Obtainability
+from livingdex.pkm import PKM
+
+
+class _GeneratorObtainability(Obtainability):
+    # Runs the encounter generator on every check, as before the encounter index
+    def __init__(  # type: ignore[no-any-unimported]
+        self, context: PKHeX.Core.EntityContext, blank_pkm: PKHeX.Core.PKM
+    ) -> None:
+        super().__init__(context, blank_pkm)
+        self.blank_pkm = blank_pkm
+
+    def _is_obtainable(
+        self,
+        pkm: PKM,
+        *,
+        allow_transfers: bool,
+        allow_events: bool,
+        checked_forms: set[tuple[int, int]] | None,
+    ) -> bool:
+        if (
+            self.context == PKHeX.Core.EntityContext.Gen9
+            and PKHeX.Core.Species(pkm.species) == PKHeX.Core.Species.Gimmighoul
+            and pkm.form == 1
+        ):
+            return True
+
+        if checked_forms is None:
+            checked_forms = set()
+        checked_forms.add((pkm.species, pkm.form))
+
+        blank = self.blank_pkm.Clone()
+        blank.Species = pkm.species
+        blank.Form = pkm.form
+        PKHeX.Core.GenderApplicator.SetSaneGender(blank, None)
+        if (
+            self.context
+            in (PKHeX.Core.EntityContext.Gen6, PKHeX.Core.EntityContext.Gen7)
+            and pkm.species == int(PKHeX.Core.Species.Meowstic)
+            and pkm.form == 1
+        ):
+            blank.Gender = 1
+
+        versions = [] if allow_transfers else self.encounters.versions
+        encs = [
+            enc
+            for enc in PKHeX.Core.EncounterMovesetGenerator.GenerateEncounters(
+                blank, System.ReadOnlyMemory[System.UInt16]([]), *versions
+            )
+            if allow_events
+            or not (
+                isinstance(
+                    enc.__implementation__,
+                    PKHeX.Core.MysteryGift | PKHeX.Core.EncounterOutbreak9,
+                )
+                or (
+                    isinstance(enc.__implementation__, PKHeX.Core.ITeraRaid9)
+                    and enc.__implementation__.IsDistribution
+                )
+            )
+        ]
+
+        if encs and all(
+            isinstance(x.__implementation__, PKHeX.Core.IEncounterEgg) for x in encs
+        ):
+            tree = PKHeX.Core.EvolutionTree.GetEvolutionTree(self.context)
+            related = [
+                (x.Item1, x.Item2)
+                for x in tree.GetEvolutionsAndPreEvolutions(pkm.species, pkm.form)
+                if (x.Item1, x.Item2) not in checked_forms
+            ]
+            other_parents = {
+                (int(k1), k2): (int(v1), v2)
+                for k1, k2, v1, v2 in (
+                    (PKHeX.Core.Species.NidoranF, 0, PKHeX.Core.Species.NidoranM, 0),
+                    (PKHeX.Core.Species.NidoranM, 0, PKHeX.Core.Species.NidoranF, 0),
+                    (PKHeX.Core.Species.Volbeat, 0, PKHeX.Core.Species.Illumise, 0),
+                    (PKHeX.Core.Species.Illumise, 0, PKHeX.Core.Species.Volbeat, 0),
+                    (PKHeX.Core.Species.Phione, 0, PKHeX.Core.Species.Manaphy, 0),
+                    (PKHeX.Core.Species.Indeedee, 0, PKHeX.Core.Species.Indeedee, 1),
+                    (PKHeX.Core.Species.Indeedee, 1, PKHeX.Core.Species.Indeedee, 0),
+                )
+            }
+            if other_parent := other_parents.get((pkm.species, pkm.form)):
+                related.append(other_parent)
+            return any(
+                self.is_obtainable(
+                    PKM(self.context, species, form),
+                    allow_transfers=allow_transfers,
+                    allow_events=allow_events,
+                    checked_forms=checked_forms,
+                )
+                for species, form in related
+            )
+
+        for enc in encs:
+            species = enc.Species
+            form = enc.Form
+            if (
+                PKHeX.Core.Species(species)
+                in (
+                    PKHeX.Core.Species.Scatterbug,
+                    PKHeX.Core.Species.Spewpa,
+                    PKHeX.Core.Species.Vivillon,
+                )
+                and form == PKHeX.Core.EncounterUtil.FormVivillon
+                and pkm.form <= PKHeX.Core.Vivillon3DS.MaxWildFormID
+            ) or form == PKHeX.Core.EncounterUtil.FormRandom:
+                form = pkm.form
+            if species == pkm.species and (
+                form == pkm.form
+                or PKHeX.Core.FormInfo.IsFormChangeable(
+                    species, form, pkm.form, self.context, self.context
+                )
+            ):
+                return True
+            if pkm.evolves_from(PKM(self.context, species, form)):
+                return True
+
+        if aliases := pkm.form_aliases:
+            return any(
+                self.is_obtainable(
+                    PKM(self.context, pkm.species, form),
+                    allow_transfers=allow_transfers,
+                    allow_events=allow_events,
+                    checked_forms=checked_forms,
+                )
+                for form in aliases
+                if form != pkm.form
+            )
+
+        return False
+
+
+@pytest.mark.parametrize(
+    ("version", "allow_transfers"),
+    [
+        ("SL", False),
+        ("SW", False),
+        ("BD", False),
+        ("US", False),
+        ("US", True),
+    ],
+)
+def test_obtainability(version: str, *, allow_transfers: bool) -> None:
+    save = PKHeX.Core.BlankSaveFile.Get(getattr(PKHeX.Core.GameVersion, version))
+    context = save.Context
+    indexed = Obtainability(context, save.BlankPKM)
+    generated = _GeneratorObtainability(context, save.BlankPKM)
+
+    # Every tenth species, with all of their forms, plus a few special cases
+    species_ids = {
+        *range(1, save.MaxSpeciesID + 1, 10),
+        *(
+            int(x)
+            for x in (
+                PKHeX.Core.Species.Pikachu,
+                PKHeX.Core.Species.Eevee,
+                PKHeX.Core.Species.Meowstic,
+                PKHeX.Core.Species.Vivillon,
+                PKHeX.Core.Species.Phione,
+                PKHeX.Core.Species.Indeedee,
+            )
+            if int(x) <= save.MaxSpeciesID
+        ),
+    }
+    for species in sorted(species_ids):
+        for form in range(save.Personal[species, 0].FormCount):
+            if not save.Personal.IsPresentInGame(species, form):
+                continue
+            pkm = PKM(context, species, form)
+            for allow_events in (False, True):
+                assert indexed.is_obtainable(
+                    pkm, allow_transfers=allow_transfers, allow_events=allow_events
+                ) == generated.is_obtainable(
+                    pkm, allow_transfers=allow_transfers, allow_events=allow_events
+                ), (species, form, allow_events)
@@ -0,0 +1,74 @@
+import asyncio
+from collections.abc import Callable
+
+from livingdex.reload_scheduler import ReloadScheduler
+
+
+async def _test_reload_scheduler() -> None:
+    reloads: list[str] = []
+    published: list[str] = []
+    results = {"c": [True, False]}
+    updated = asyncio.Condition()
+    release_reload = asyncio.Event()
+    release_publish = asyncio.Event()
+
+    async def notify() -> None:
+        async with updated:
+            updated.notify_all()
+
+    async def wait_for(predicate: Callable[[], bool]) -> None:
+        async with asyncio.timeout(5), updated:
+            await updated.wait_for(predicate)
+
+    async def reload(item: str) -> bool:
+        reloads.append(item)
+        await notify()
+        await release_reload.wait()
+        return results[item].pop(0) if item in results else True
+
+    async def on_reloaded(item: str) -> None:
+        published.append(item)
+        await notify()
+        if item == "c":
+            await release_publish.wait()
+
+    scheduler = ReloadScheduler(reload, on_reloaded, debounce=0.01, concurrency=2)
+
+    # A burst of requests is merged into a single reload
+    for _ in range(5):
+        scheduler.request("a")
+    scheduler.request("b")
+    await wait_for(lambda: len(reloads) == 2)
+    assert sorted(reloads) == ["a", "b"]
+
+    # A request arriving during a reload supersedes its result
+    scheduler.request("a")
+    release_reload.set()
+    await wait_for(lambda: len(published) == 2)
+
+    assert reloads.count("a") == 2
+    assert sorted(published) == ["a", "b"]
+    assert scheduler.stats["a"].superseded == 1
+
+    # A request arriving while publishing is reloaded, but only published again
+    # if something changed
+    scheduler.request("c")
+    await wait_for(lambda: "c" in published)
+    scheduler.request("c")
+    release_publish.set()
+    await wait_for(lambda: reloads.count("c") == 2)
+
+    assert published.count("c") == 1
+
+    # A request right after a task is done, before its callbacks ran, is not
+    # lost
+    scheduler.request("d")
+    await wait_for(lambda: "d" in published)
+    scheduler.request("d")
+    await wait_for(lambda: reloads.count("d") == 2)
+
+    await scheduler.close()
+
+
+def test_reload_scheduler() -> None:
+    asyncio.run(_test_reload_scheduler())
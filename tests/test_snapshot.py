@@ -0,0 +1,136 @@
+import random
+from typing import cast
+
+from livingdex import game_info
+from livingdex.snapshot import DIFF_LOG_SIZE, GameSnapshot
+
+type Slots = dict[tuple[int, int], tuple[int, str]]
+
+
+class _Pokemon:
+    def __init__(self, species: int) -> None:
+        self.species = species
+
+    def __bool__(self) -> bool:
+        return self.species != 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Pokemon) and other.species == self.species
+
+    def __hash__(self) -> int:
+        return hash(self.species)
+
+    def evolves_from(self, other: _Pokemon) -> bool:
+        return self.species == other.species + 1
+
+
+# Interned like PKM objects, snapshots compare slots by identity
+_pokemon = [_Pokemon(x) for x in range(12)]
+
+
+class _Layout:
+    def __init__(self, boxes: list[list[int]]) -> None:
+        self.boxes = [[_pokemon[x] for x in box] for box in boxes]
+        self.positions: dict[_Pokemon, list[tuple[int, int]]] = {}
+        self.unindexed_positions: list[tuple[int, int]] = []
+        for box_id, box in enumerate(self.boxes):
+            for slot_id, pokemon in enumerate(box):
+                if pokemon:
+                    self.positions.setdefault(pokemon, []).append((box_id, slot_id))
+
+    def display_name(self, pokemon: _Pokemon) -> str:
+        return f"#{pokemon.species}"
+
+
+class _Save:
+    def __init__(self, layout: _Layout, box_data: list[list[_Pokemon]]) -> None:
+        self.layout = layout
+        self.box_data = box_data
+        self.party_data: list[_Pokemon] = []
+        self.box_slot_count = 4
+
+
+_layout = _Layout([[1, 3, 5, 0], [7, 9, 11, 0]])
+
+
+def _random_save(rng: random.Random, layout: _Layout) -> game_info.GameInfo:
+    box_data = [
+        [rng.choice(_pokemon[:4] + layout.boxes[box_id]) for _ in range(4)]
+        for box_id in range(rng.randint(1, len(layout.boxes)))
+    ]
+    return cast("game_info.GameInfo", _Save(layout, box_data))
+
+
+def _random_inputs(
+    rng: random.Random, layout: _Layout = _layout
+) -> tuple[game_info.GameInfo, dict[str, game_info.GameInfo]]:
+    save = _random_save(rng, layout)
+    if rng.random() < 0.5:
+        return save, {}
+    # Varying names keep adding new texts
+    return save, {f"Other {rng.randint(1, 100)}": _random_save(rng, layout)}
+
+
+def _slots(snapshot: GameSnapshot) -> Slots:
+    return {
+        (box_id, slot_id): snapshot.slot(box_id, slot_id)
+        for box_id, box in enumerate(snapshot.statuses)
+        for slot_id in range(len(box))
+    }
+
+
+def _apply_changes(slots: Slots, snapshot: GameSnapshot, version: int) -> Slots:
+    changes = snapshot.changes_since(version)
+    assert changes is not None
+    slots = dict(slots)
+    for box_id, slot_id, status, text_id in changes:
+        slots[box_id, slot_id] = (status, snapshot.texts[text_id])
+    return slots
+
+
+def test_incremental_build() -> None:
+    rng = random.Random(0)
+    snapshot = GameSnapshot.build(None, "Main", *_random_inputs(rng), {})
+    for _ in range(300):
+        previous = snapshot
+        inputs = _random_inputs(rng)
+        snapshot = GameSnapshot.build(previous, "Main", *inputs, {})
+        full = GameSnapshot.build(None, "Main", *inputs, {})
+
+        assert snapshot.version == previous.version + 1
+        assert _slots(snapshot) == _slots(full)
+        assert (snapshot.caught, snapshot.total) == (full.caught, full.total)
+        assert len(snapshot.texts) <= 2 * len({0}.union(*snapshot.text_ids))
+        assert _apply_changes(_slots(previous), snapshot, previous.version) == (
+            _slots(full)
+        )
+
+
+def test_changes_since() -> None:
+    rng = random.Random(1)
+    snapshots = [GameSnapshot.build(None, "Main", *_random_inputs(rng), {})]
+    for _ in range(DIFF_LOG_SIZE * 2):
+        snapshots.append(
+            GameSnapshot.build(snapshots[-1], "Main", *_random_inputs(rng), {})
+        )
+    snapshot = snapshots[-1]
+
+    assert snapshot.changes_since(snapshot.version) == []
+
+    # Versions still in the log are brought up to date
+    for previous in snapshots[-DIFF_LOG_SIZE - 1 : -1]:
+        assert _apply_changes(_slots(previous), snapshot, previous.version) == (
+            _slots(snapshot)
+        )
+
+    # Older versions need the whole grid again
+    for previous in snapshots[: -DIFF_LOG_SIZE - 1]:
+        assert snapshot.changes_since(previous.version) is None
+
+    # So do all previous versions once the layout changes
+    other_layout = _Layout([[1, 3, 5, 7], [9, 11, 0, 0]])
+    snapshot = GameSnapshot.build(
+        snapshot, "Main", *_random_inputs(rng, other_layout), {}
+    )
+    assert snapshot.changes_since(snapshot.version - 1) is None
+    assert snapshot.changes_since(snapshot.version) == []